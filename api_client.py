@@ -1,39 +1,226 @@
+import re
+import atexit
 import requests
+from requests.adapters import HTTPAdapter
 import time
+import random
+import json
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import List, Dict, Any, Iterable, Iterator, Mapping, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # Fall back to requests' stdlib json decoding
+    orjson = None
 from config import (
     UAE_REAL_ESTATE_API_KEY, UAE_REAL_ESTATE_BASE_URL, 
     APIFY_API_TOKEN, APIFY_BASE_URL,
-    TARGET_LOCATIONS, PROPERTY_TYPES, LISTING_TYPES,
-    API_RATE_LIMIT_DELAY, REQUEST_TIMEOUT, MAX_RETRIES
+    TARGET_LOCATIONS, TARGET_LOCATION_RE, PROPERTY_TYPES, LISTING_TYPES,
+    API_RATE_LIMIT_DELAY, API_MAX_CONCURRENCY, REQUEST_TIMEOUT, MAX_RETRIES,
+    API_CACHE_TTLS, API_CACHE_MAX_ENTRIES, API_CACHE_MAX_STALE_TTLS,
+    SCRAPER_POLL_INITIAL_DELAY, SCRAPER_POLL_MAX_DELAY,
+    RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX, APIFY_RUN_REUSE_SECONDS, DATABASE_PATH,
+    DEBUG_RAW_DATA
 )
+from database import PropertyDatabase
 
 logger = logging.getLogger(__name__)
 
+_PRICE_RE = re.compile(r'[\d,]+')
+
+_UAE_HEADERS = MappingProxyType({
+    "x-rapidapi-key": UAE_REAL_ESTATE_API_KEY,
+    "x-rapidapi-host": "uae-real-estate.p.rapidapi.com"
+})
+
+_APIFY_HEADERS = MappingProxyType({
+    "Authorization": f"Bearer {APIFY_API_TOKEN}",
+    "Content-Type": "application/json"
+})
+
+def is_target_location(location: str) -> bool:
+    """Check if location matches target area"""
+    return bool(location) and TARGET_LOCATION_RE.search(location) is not None
+
+def _decode_json(response: requests.Response) -> Any:
+    """Decode a JSON response body, using orjson when available"""
+    if orjson is None:
+        return response.json()
+    
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.InvalidJSONError(str(e), response=response)
+
+def _create_session() -> requests.Session:
+    """Create the HTTP session shared by all API clients"""
+    session = requests.Session()
+    
+    # Keep connections alive across polling iterations; retries are handled manually
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, pool_block=False, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Connection": "keep-alive",
+        "Accept-Encoding": "gzip, deflate"
+    })
+    return session
+
+_SHARED_SESSION = _create_session()
+atexit.register(_SHARED_SESSION.close)
+
+@dataclass(slots=True, frozen=True)
+class Property:
+    """Normalized property listing returned by the API clients"""
+    external_id: str
+    title: str
+    location: str
+    property_type: str
+    listing_type: str
+    price: float
+    bedrooms: Any
+    bathrooms: Any
+    size_sqft: Any
+    description: str
+    url: str
+    source: str
+    raw_data: Optional[Dict[str, Any]] = None
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style field access for consumers of plain property dicts"""
+        return getattr(self, key, default)
+
 class APIClient:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.timeout = REQUEST_TIMEOUT
+    # Response cache shared by all clients: key -> (expires_at, data), least recently used first.
+    # Expired entries are kept as a bounded-age stale fallback until evicted by size.
+    _response_cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    cache_hits = 0
+    cache_misses = 0
+    
+    # Request pacing shared by all clients and worker threads
+    _rate_lock = threading.Lock()
+    _next_request_at = 0.0
     
-    def _make_request_with_retry(self, url: str, headers: Dict[str, str], 
-                                params: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
-        """Make HTTP request with retry logic"""
+    def __init__(self, headers: Mapping[str, str] = None):
+        self.session = _SHARED_SESSION
+        self.headers = headers
+    
+    @staticmethod
+    def _cache_key(url: str, params: Dict[str, Any] = None) -> str:
+        """Build a cache key from the request URL and parameters"""
+        if orjson is not None:
+            params_bytes = orjson.dumps(params or {}, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+                                        default=str)
+        else:
+            params_bytes = json.dumps(params or {}, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(url.encode() + params_bytes, digest_size=16).hexdigest()
+    
+    @staticmethod
+    def _cache_ttl(url: str) -> int:
+        """Get cache TTL in seconds for an endpoint (0 disables caching)"""
+        for endpoint, ttl in API_CACHE_TTLS.items():
+            if url.endswith(endpoint):
+                return ttl
+        return 0
+    
+    @staticmethod
+    def _iter_target_properties(raw_items: Iterable[Dict[str, Any]], extract_location,
+                                normalize) -> Iterator[Property]:
+        """Yield normalized properties, skipping items outside target locations before normalizing"""
+        for item in raw_items:
+            location = extract_location(item)
+            if not is_target_location(location):
+                continue
+            
+            property_data = normalize(item, location)
+            if property_data:
+                yield property_data
+    
+    @classmethod
+    def _store_cached_response(cls, cache_key: str, expires_at: float, data: Any):
+        """Cache a response, evicting the least recently used entries beyond the size cap"""
+        with cls._cache_lock:
+            cls._response_cache[cache_key] = (expires_at, data)
+            cls._response_cache.move_to_end(cache_key)
+            while len(cls._response_cache) > API_CACHE_MAX_ENTRIES:
+                cls._response_cache.popitem(last=False)
+    
+    def _wait_for_rate_limit(self):
+        """Block until the shared rate limit allows another request"""
+        with APIClient._rate_lock:
+            now = time.monotonic()
+            wait = APIClient._next_request_at - now
+            APIClient._next_request_at = max(now, APIClient._next_request_at) + API_RATE_LIMIT_DELAY
+        
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _make_request_with_retry(self, url: str, params: Dict[str, Any] = None,
+                                cache_fallback: bool = True) -> Optional[Dict[str, Any]]:
+        """Make HTTP request with retry logic and response caching"""
+        ttl = self._cache_ttl(url)
+        cache_key = self._cache_key(url, params) if ttl else None
+        
+        if cache_key:
+            with self._cache_lock:
+                cached = self._response_cache.get(cache_key)
+                fresh = cached is not None and cached[0] > time.time()
+                if fresh:
+                    self._response_cache.move_to_end(cache_key)
+                    APIClient.cache_hits += 1
+                else:
+                    APIClient.cache_misses += 1
+            if fresh:
+                logger.debug(f"Cache hit for URL: {url}")
+                return cached[1]
+        
         for attempt in range(MAX_RETRIES):
             try:
-                time.sleep(API_RATE_LIMIT_DELAY)  # Rate limiting
+                self._wait_for_rate_limit()
                 
-                response = self.session.get(url, headers=headers, params=params)
+                response = self.session.get(url, headers=self.headers, params=params, timeout=REQUEST_TIMEOUT)
                 response.raise_for_status()
+                logger.debug(f"{url} answered over HTTP/{response.raw.version / 10:.1f} in {response.elapsed.total_seconds():.2f}s")
+                
+                data = _decode_json(response)
+                if cache_key:
+                    self._store_cached_response(cache_key, time.time() + ttl, data)
                 
-                return response.json()
+                return data
                 
             except requests.exceptions.RequestException as e:
                 logger.warning(f"Request attempt {attempt + 1} failed: {e}")
                 if attempt == MAX_RETRIES - 1:
                     logger.error(f"All retry attempts failed for URL: {url}")
+                    
+                    # Serve the last known response rather than failing outright, unless it is
+                    # too old to stand in for current listings
+                    if cache_key and cache_fallback:
+                        with self._cache_lock:
+                            stale = self._response_cache.get(cache_key)
+                        if stale:
+                            age = time.time() - (stale[0] - ttl)
+                            if age <= ttl * API_CACHE_MAX_STALE_TTLS:
+                                logger.warning(f"Returning stale cached response ({age:.0f}s old) for URL: {url}")
+                                return stale[1]
+                            logger.warning(f"Cached response for URL {url} is {age:.0f}s old, not serving it")
                     raise
-                time.sleep(2 ** attempt)  # Exponential backoff
+                
+                # Honor Retry-After when given (clamped to the backoff cap), otherwise
+                # full-jitter exponential backoff
+                retry_after = e.response.headers.get("Retry-After") if e.response is not None else None
+                try:
+                    delay = max(0.0, min(float(retry_after), RETRY_BACKOFF_MAX))
+                except (TypeError, ValueError):
+                    delay = random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt))
+                time.sleep(delay)
         
         return None
 
@@ -41,12 +228,8 @@ class UAERealeStateAPIClient(APIClient):
     """Client for UAE Real Estate API (Zyla API Hub)"""
     
     def __init__(self):
-        super().__init__()
+        super().__init__(_UAE_HEADERS)
         self.base_url = UAE_REAL_ESTATE_BASE_URL
-        self.headers = {
-            "x-rapidapi-key": UAE_REAL_ESTATE_API_KEY,
-            "x-rapidapi-host": "uae-real-estate.p.rapidapi.com"
-        }
     
     def get_location_suggestions(self, query: str) -> List[Dict[str, Any]]:
         """Get location autocomplete suggestions"""
@@ -58,7 +241,7 @@ class UAERealeStateAPIClient(APIClient):
             url = f"{self.base_url}/auto-complete"
             params = {"query": query}
             
-            response = self._make_request_with_retry(url, self.headers, params)
+            response = self._make_request_with_retry(url, params)
             
             if response and "hits" in response:
                 return response["hits"]
@@ -72,7 +255,7 @@ class UAERealeStateAPIClient(APIClient):
     
     def get_properties(self, location_external_id: str = None, 
                       property_type: str = None, listing_type: str = "rent",
-                      min_price: float = None, max_price: float = None) -> List[Dict[str, Any]]:
+                      min_price: float = None, max_price: float = None) -> List[Property]:
         """Get property listings"""
         if not UAE_REAL_ESTATE_API_KEY:
             logger.warning("UAE Real Estate API key not provided")
@@ -93,14 +276,12 @@ class UAERealeStateAPIClient(APIClient):
             if max_price:
                 params["priceMax"] = max_price
             
-            response = self._make_request_with_retry(url, self.headers, params)
+            response = self._make_request_with_retry(url, params)
             
             if response and "hits" in response:
-                properties = []
-                for hit in response["hits"]:
-                    property_data = self._normalize_uae_property(hit)
-                    if self._is_target_location(property_data.get("location", "")):
-                        properties.append(property_data)
+                properties = list(self._iter_target_properties(
+                    response["hits"], self._extract_uae_location, self._normalize_uae_property
+                ))
                 
                 logger.info(f"Found {len(properties)} properties in target locations from UAE API")
                 return properties
@@ -111,84 +292,85 @@ class UAERealeStateAPIClient(APIClient):
             logger.error(f"Error fetching properties from UAE API: {e}")
             return []
     
-    def _normalize_uae_property(self, raw_property: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _extract_uae_location(raw_property: Dict[str, Any]) -> str:
+        """Extract the location string from a UAE API property"""
+        geo = raw_property.get("geography") or {}
+        return ", ".join(
+            v for v in (geo.get("level1"), geo.get("level2"), geo.get("level3"), geo.get("level4")) if v
+        )
+    
+    def _normalize_uae_property(self, raw_property: Dict[str, Any],
+                                location: str = None) -> Optional[Property]:
         """Normalize UAE API property data to standard format"""
         try:
             # Extract location information
-            location = ""
-            if "geography" in raw_property:
-                location_parts = []
-                for level in ["level1", "level2", "level3", "level4"]:
-                    if level in raw_property["geography"] and raw_property["geography"][level]:
-                        location_parts.append(raw_property["geography"][level])
-                location = ", ".join(location_parts)
+            if location is None:
+                location = self._extract_uae_location(raw_property)
             
             # Extract property details
+            category = raw_property.get("category")
+            property_type = category[0].get("name", "").lower() if category else ""
             rooms = raw_property.get("rooms", 0)
             baths = raw_property.get("baths", 0)
             
             # Parse area
-            area = 0
-            if "area" in raw_property and raw_property["area"]:
-                try:
-                    area = float(raw_property["area"])
-                except (ValueError, TypeError):
-                    area = 0
+            try:
+                area = float(raw_property.get("area") or 0)
+            except (ValueError, TypeError):
+                area = 0
             
             # Extract price
-            price = 0
-            if "price" in raw_property and raw_property["price"]:
-                try:
-                    price = float(raw_property["price"])
-                except (ValueError, TypeError):
-                    price = 0
+            try:
+                price = float(raw_property.get("price") or 0)
+            except (ValueError, TypeError):
+                price = 0
             
-            return {
-                "external_id": str(raw_property.get("externalID", "")),
-                "title": raw_property.get("title", ""),
-                "location": location,
-                "property_type": raw_property.get("category", [{}])[0].get("name", "").lower() if raw_property.get("category") else "",
-                "listing_type": raw_property.get("purpose", "").lower(),
-                "price": price,
-                "bedrooms": rooms,
-                "bathrooms": baths,
-                "size_sqft": area,
-                "description": raw_property.get("description", ""),
-                "url": f"https://www.bayut.com/property/details-{raw_property.get('externalID', '')}",
-                "source": "uae_api",
-                "raw_data": raw_property
-            }
+            return Property(
+                external_id=str(raw_property.get("externalID", "")),
+                title=raw_property.get("title", ""),
+                location=location,
+                property_type=property_type,
+                listing_type=raw_property.get("purpose", "").lower(),
+                price=price,
+                bedrooms=rooms,
+                bathrooms=baths,
+                size_sqft=area,
+                description=raw_property.get("description", ""),
+                url=f"https://www.bayut.com/property/details-{raw_property.get('externalID', '')}",
+                source="uae_api",
+                raw_data=raw_property if DEBUG_RAW_DATA else None
+            )
             
         except Exception as e:
             logger.error(f"Error normalizing UAE API property: {e}")
-            return {}
-    
-    def _is_target_location(self, location: str) -> bool:
-        """Check if location matches target area"""
-        location_lower = location.lower()
-        for target in TARGET_LOCATIONS:
-            if target.lower() in location_lower:
-                return True
-        return False
+            return None
 
 class ApifyClient(APIClient):
     """Client for Apify scrapers"""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, db: Optional[PropertyDatabase] = None):
+        super().__init__(_APIFY_HEADERS)
         self.base_url = APIFY_BASE_URL
-        self.headers = {
-            "Authorization": f"Bearer {APIFY_API_TOKEN}",
-            "Content-Type": "application/json"
-        }
+        self.db = db or PropertyDatabase(DATABASE_PATH)
     
-    def run_propertyfinder_scraper(self, location: str = "ras-al-khor") -> List[Dict[str, Any]]:
-        """Run PropertyFinder scraper via Apify"""
+    def run_propertyfinder_scraper(self, location: str = "ras-al-khor") -> Iterator[Property]:
+        """Run PropertyFinder scraper via Apify, yielding properties in target locations"""
         if not APIFY_API_TOKEN:
             logger.warning("Apify API token not provided")
             return []
         
         try:
+            # Reuse the last run's dataset if it is recent enough, skipping an actor cold start
+            last_run = self.db.get_last_scraper_run(location)
+            if last_run and time.time() - last_run["finished_at"] < APIFY_RUN_REUSE_SECONDS:
+                logger.info(f"Reusing recent PropertyFinder scraper run: {last_run['run_id']}")
+                items = self._fetch_dataset(last_run["run_id"])
+                if items:
+                    return self._iter_target_properties(
+                        items, self._extract_apify_location, self._normalize_apify_property
+                    )
+            
             # Start scraper run
             run_input = {
                 "location": location,
@@ -198,7 +380,7 @@ class ApifyClient(APIClient):
             }
             
             url = f"{self.base_url}/acts/dhrumil~propertyfinder-scraper/runs"
-            response = self._make_request_with_retry(url, self.headers, run_input)
+            response = self._make_request_with_retry(url, run_input)
             
             if not response or "data" not in response:
                 logger.error("Failed to start PropertyFinder scraper")
@@ -208,57 +390,66 @@ class ApifyClient(APIClient):
             logger.info(f"Started PropertyFinder scraper run: {run_id}")
             
             # Wait for completion and get results
-            return self._wait_for_scraper_results(run_id)
+            items = self._wait_for_scraper_results(run_id)
+            if items:
+                self.db.record_scraper_run(location, run_id)
+            
+            return self._iter_target_properties(
+                items, self._extract_apify_location, self._normalize_apify_property
+            )
             
         except Exception as e:
             logger.error(f"Error running PropertyFinder scraper: {e}")
             return []
     
     def _wait_for_scraper_results(self, run_id: str, max_wait_minutes: int = 10) -> List[Dict[str, Any]]:
-        """Wait for scraper to complete and return results"""
-        max_checks = max_wait_minutes * 6  # Check every 10 seconds
+        """Wait for scraper to complete and return its raw dataset items"""
+        deadline = time.monotonic() + max_wait_minutes * 60
+        poll_delay = SCRAPER_POLL_INITIAL_DELAY
         
-        for check in range(max_checks):
+        while time.monotonic() < deadline:
             try:
                 # Check run status
                 status_url = f"{self.base_url}/acts/dhrumil~propertyfinder-scraper/runs/{run_id}"
-                status_response = self._make_request_with_retry(status_url, self.headers)
+                status_response = self._make_request_with_retry(status_url)
                 
-                if not status_response or "data" not in status_response:
-                    continue
-                
-                status = status_response["data"]["status"]
-                
-                if status == "SUCCEEDED":
-                    # Get results
-                    results_url = f"{self.base_url}/acts/dhrumil~propertyfinder-scraper/runs/{run_id}/dataset/items"
-                    results_response = self._make_request_with_retry(results_url, self.headers)
+                if status_response and "data" in status_response:
+                    status = status_response["data"]["status"]
                     
-                    if results_response:
-                        properties = []
-                        for item in results_response:
-                            property_data = self._normalize_apify_property(item)
-                            if self._is_target_location(property_data.get("location", "")):
-                                properties.append(property_data)
+                    if status == "SUCCEEDED":
+                        # Get results
+                        results_response = self._fetch_dataset(run_id)
                         
-                        logger.info(f"PropertyFinder scraper completed: {len(properties)} target properties found")
-                        return properties
-                
-                elif status in ["FAILED", "ABORTED", "TIMED-OUT"]:
-                    logger.error(f"PropertyFinder scraper failed with status: {status}")
-                    return []
-                
-                # Wait before next check
-                time.sleep(10)
+                        if results_response:
+                            logger.info(f"PropertyFinder scraper completed: {len(results_response)} items returned")
+                            return results_response
+                    
+                    elif status in ["FAILED", "ABORTED", "TIMED-OUT"]:
+                        logger.error(f"PropertyFinder scraper failed with status: {status}")
+                        return []
                 
             except Exception as e:
                 logger.error(f"Error checking scraper status: {e}")
-                time.sleep(10)
+            
+            # Back off between checks, with jitter so polls don't line up
+            time.sleep(poll_delay + random.uniform(0, 0.5))
+            poll_delay = min(poll_delay * 1.5, SCRAPER_POLL_MAX_DELAY)
         
         logger.warning("PropertyFinder scraper timed out")
         return []
     
-    def _normalize_apify_property(self, raw_property: Dict[str, Any]) -> Dict[str, Any]:
+    def _fetch_dataset(self, run_id: str) -> List[Dict[str, Any]]:
+        """Fetch the dataset items produced by a scraper run"""
+        results_url = f"{self.base_url}/acts/dhrumil~propertyfinder-scraper/runs/{run_id}/dataset/items"
+        return self._make_request_with_retry(results_url) or []
+    
+    @staticmethod
+    def _extract_apify_location(raw_property: Dict[str, Any]) -> str:
+        """Extract the location string from an Apify scraper property"""
+        return raw_property.get("location", raw_property.get("address", ""))
+    
+    def _normalize_apify_property(self, raw_property: Dict[str, Any],
+                                  location: str = None) -> Optional[Property]:
         """Normalize Apify scraper property data to standard format"""
         try:
             # Extract price
@@ -266,89 +457,105 @@ class ApifyClient(APIClient):
             price_str = raw_property.get("price", "")
             if price_str:
                 # Remove currency symbols and commas, extract numbers
-                import re
-                price_match = re.search(r'[\d,]+', str(price_str).replace(',', ''))
+                price_match = _PRICE_RE.search(str(price_str))
                 if price_match:
                     try:
                         price = float(price_match.group().replace(',', ''))
                     except ValueError:
                         price = 0
             
-            return {
-                "external_id": str(raw_property.get("id", raw_property.get("propertyId", ""))),
-                "title": raw_property.get("title", raw_property.get("name", "")),
-                "location": raw_property.get("location", raw_property.get("address", "")),
-                "property_type": raw_property.get("propertyType", "").lower(),
-                "listing_type": raw_property.get("purpose", "rent").lower(),
-                "price": price,
-                "bedrooms": raw_property.get("bedrooms", raw_property.get("rooms", 0)),
-                "bathrooms": raw_property.get("bathrooms", raw_property.get("baths", 0)),
-                "size_sqft": raw_property.get("area", raw_property.get("size", 0)),
-                "description": raw_property.get("description", ""),
-                "url": raw_property.get("url", raw_property.get("link", "")),
-                "source": "apify_propertyfinder",
-                "raw_data": raw_property
-            }
+            return Property(
+                external_id=str(raw_property.get("id", raw_property.get("propertyId", ""))),
+                title=raw_property.get("title", raw_property.get("name", "")),
+                location=location if location is not None else self._extract_apify_location(raw_property),
+                property_type=raw_property.get("propertyType", "").lower(),
+                listing_type=raw_property.get("purpose", "rent").lower(),
+                price=price,
+                bedrooms=raw_property.get("bedrooms", raw_property.get("rooms", 0)),
+                bathrooms=raw_property.get("bathrooms", raw_property.get("baths", 0)),
+                size_sqft=raw_property.get("area", raw_property.get("size", 0)),
+                description=raw_property.get("description", ""),
+                url=raw_property.get("url", raw_property.get("link", "")),
+                source="apify_propertyfinder",
+                raw_data=raw_property if DEBUG_RAW_DATA else None
+            )
             
         except Exception as e:
             logger.error(f"Error normalizing Apify property: {e}")
-            return {}
-    
-    def _is_target_location(self, location: str) -> bool:
-        """Check if location matches target area"""
-        location_lower = location.lower()
-        for target in TARGET_LOCATIONS:
-            if target.lower() in location_lower:
-                return True
-        return False
+            return None
 
 class PropertyAPIManager:
     """Manager class that coordinates multiple API clients"""
     
-    def __init__(self):
+    def __init__(self, db: Optional[PropertyDatabase] = None):
         self.uae_client = UAERealeStateAPIClient()
-        self.apify_client = ApifyClient()
-        # Import and initialize Wasl scraper
-        from wasl_scraper import WaslPropertyScraper
-        self.wasl_scraper = WaslPropertyScraper()
+        self.apify_client = ApifyClient(db)
+        # Import and initialize Wasl scraper; it needs Playwright, which is optional
+        try:
+            from wasl_scraper import WaslPropertyScraper
+            self.wasl_scraper = WaslPropertyScraper()
+        except ImportError as e:
+            logger.warning(f"Al Wasl scraper unavailable: {e}")
+            self.wasl_scraper = None
+    
+    @staticmethod
+    def _add_unique(unique_properties: Dict[str, Any], properties: Iterable[Any]) -> int:
+        """Add properties to the dedup map keyed by external_id, returning how many were seen"""
+        seen = 0
+        for prop in properties:
+            seen += 1
+            external_id = prop.get("external_id")
+            if external_id and external_id not in unique_properties:
+                unique_properties[external_id] = prop
+        return seen
     
     def fetch_all_properties(self) -> List[Dict[str, Any]]:
         """Fetch properties from all available sources"""
-        all_properties = []
+        # Properties are deduplicated by external_id as each source returns
+        unique_properties = {}
         
         # Try Al Wasl scraper first (primary source)
-        try:
-            logger.info("Fetching properties from Al Wasl website")
-            wasl_properties = self.wasl_scraper.fetch_properties()
-            all_properties.extend(wasl_properties)
-            logger.info(f"Al Wasl scraper returned {len(wasl_properties)} properties")
-            
-        except Exception as e:
-            logger.error(f"Error fetching from Al Wasl: {e}")
+        if self.wasl_scraper is not None:
+            try:
+                logger.info("Fetching properties from Al Wasl website")
+                wasl_properties = self.wasl_scraper.fetch_properties()
+                self._add_unique(unique_properties, wasl_properties)
+                logger.info(f"Al Wasl scraper returned {len(wasl_properties)} properties")
+                del wasl_properties
+
+            except Exception as e:
+                logger.error(f"Error fetching from Al Wasl: {e}")
         
         # Try UAE Real Estate API as backup (if no API key warnings, skip this)
         if UAE_REAL_ESTATE_API_KEY:
             try:
                 logger.info("Fetching properties from UAE Real Estate API")
                 
-                # Get location suggestions for target areas
+                # Build the full list of (location, listing type) fetches up front
+                jobs = []
                 for location in TARGET_LOCATIONS[:2]:  # Limit to avoid rate limits
                     suggestions = self.uae_client.get_location_suggestions(location)
                     
                     for suggestion in suggestions[:3]:  # Limit suggestions per location
                         if "externalID" in suggestion:
-                            # Fetch properties for each listing type
                             for listing_type in LISTING_TYPES:
-                                properties = self.uae_client.get_properties(
-                                    location_external_id=suggestion["externalID"],
-                                    listing_type=listing_type
-                                )
-                                all_properties.extend(properties)
-                                
-                                # Rate limiting
-                                time.sleep(API_RATE_LIMIT_DELAY)
+                                jobs.append((suggestion["externalID"], listing_type))
                 
-                logger.info(f"UAE API returned additional properties, total now: {len(all_properties)}")
+                # Fetch concurrently so one slow response doesn't block the rest
+                with ThreadPoolExecutor(max_workers=API_MAX_CONCURRENCY) as executor:
+                    futures = [
+                        executor.submit(
+                            self.uae_client.get_properties,
+                            location_external_id=location_external_id,
+                            listing_type=listing_type
+                        )
+                        for location_external_id, listing_type in jobs
+                    ]
+                    for future in futures:
+                        self._add_unique(unique_properties, future.result())
+                    del futures
+                
+                logger.info(f"UAE API returned additional properties, total now: {len(unique_properties)}")
                 
             except Exception as e:
                 logger.error(f"Error fetching from UAE API: {e}")
@@ -357,21 +564,13 @@ class PropertyAPIManager:
         if APIFY_API_TOKEN:
             try:
                 logger.info("Fetching properties from Apify PropertyFinder scraper")
-                apify_properties = self.apify_client.run_propertyfinder_scraper()
-                all_properties.extend(apify_properties)
+                apify_count = self._add_unique(unique_properties, self.apify_client.run_propertyfinder_scraper())
                 
-                logger.info(f"Apify scraper returned {len(apify_properties)} properties")
+                logger.info(f"Apify scraper returned {apify_count} properties")
                 
             except Exception as e:
                 logger.error(f"Error fetching from Apify: {e}")
         
-        # Remove duplicates based on external_id
-        unique_properties = {}
-        for prop in all_properties:
-            external_id = prop.get("external_id")
-            if external_id and external_id not in unique_properties:
-                unique_properties[external_id] = prop
-        
         final_properties = list(unique_properties.values())
         logger.info(f"Total unique properties found: {len(final_properties)}")
         
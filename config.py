@@ -1,10 +1,16 @@
 import os
+import re
 from typing import Dict, Any
 
 # Telegram Bot Configuration
-TELEGRAM_BOT_TOKEN = "7835804086:AAG6ScVVIJoHkH8RFpBEYUtTHInQW893xNc"
+TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
 TELEGRAM_CHAT_ID = "5868500316"
 TELEGRAM_BOT_USERNAME = "@Wasl_alert1_bot"
+TELEGRAM_CHAT_SEND_INTERVAL = 1.0  # seconds between messages; Telegram allows about 1 msg/s per chat
+LISTINGS_SUMMARY_TTL = 60  # seconds a listings summary is reused across notifications
+TELEGRAM_QUEUE_SIZE = 1000  # notifications buffered for the background sender
+TELEGRAM_BATCH_SIZE = 20  # messages the sender dispatches together
+TELEGRAM_BATCH_WAIT = 0.5  # seconds the sender waits to fill a batch
 
 # API Configuration
 UAE_REAL_ESTATE_API_KEY = os.getenv("UAE_REAL_ESTATE_API_KEY", "")
@@ -22,6 +28,7 @@ TARGET_LOCATIONS = [
     "Ras al Khor Industrial Area 3",
     "Ras Al Khor Ind Third"
 ]
+TARGET_LOCATION_RE = re.compile("|".join(re.escape(t) for t in TARGET_LOCATIONS), re.IGNORECASE)
 
 # Property Types to Monitor
 PROPERTY_TYPES = ["apartment", "villa", "townhouse", "commercial", "warehouse", "office"]
@@ -33,15 +40,31 @@ DATABASE_PATH = "property_listings.db"
 # Monitoring Configuration
 MONITORING_INTERVAL_MINUTES = 10  # Reduced from 30 to 10 minutes
 MAX_RETRIES = 3
+RETRY_BACKOFF_BASE = 1  # seconds, doubled per retry attempt
+RETRY_BACKOFF_MAX = 30  # cap for retry backoff in seconds
 REQUEST_TIMEOUT = 30
 
 # Rate Limiting
 API_RATE_LIMIT_DELAY = 1  # seconds between API calls
+API_MAX_CONCURRENCY = 4  # concurrent property fetches per source
 MAX_PROPERTIES_PER_REQUEST = 50
+SCRAPER_POLL_INITIAL_DELAY = 2  # seconds before the first scraper status re-check
+SCRAPER_POLL_MAX_DELAY = 30  # cap for scraper status polling backoff
+APIFY_RUN_REUSE_SECONDS = 600  # reuse a finished scraper run's dataset within this window
+
+# Response Caching (seconds per endpoint suffix, unlisted endpoints are not cached)
+API_CACHE_TTLS = {
+    "/auto-complete": 3600,
+    "/properties/list": 300,
+    "/dataset/items": 60
+}
+API_CACHE_MAX_ENTRIES = 256  # least recently used responses are evicted beyond this
+API_CACHE_MAX_STALE_TTLS = 12  # after retries fail, serve a cached response at most this many TTLs old
 
 # Logging Configuration
 LOG_LEVEL = "INFO"
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+DEBUG_RAW_DATA = False  # keep raw upstream payloads on normalized properties
 
 # Error Handling
 MAX_CONSECUTIVE_ERRORS = 5
@@ -1,16 +1,248 @@
 import sqlite3
 import hashlib
 import json
+import time
 import logging
-from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+import queue
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
 from contextlib import contextmanager
+from itertools import chain, islice
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json serialization
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+_SQL_INSERT_PROPERTY_PREFIX = '''
+    INSERT INTO properties (
+        external_id, property_hash, title, location, property_type,
+        listing_type, price, bedrooms, bathrooms, size_sqft,
+        description, url, source, raw_data
+    ) VALUES '''
+_PROPERTY_PLACEHOLDERS = "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_SQL_INSERT_PROPERTY = _SQL_INSERT_PROPERTY_PREFIX + _PROPERTY_PLACEHOLDERS
+
+# Overwrites an existing row with the incoming values and reactivates it
+_SQL_UPSERT_SET = '''
+    ON CONFLICT(external_id) DO UPDATE SET
+        property_hash = excluded.property_hash,
+        title = excluded.title,
+        location = excluded.location,
+        property_type = excluded.property_type,
+        listing_type = excluded.listing_type,
+        previous_price = CASE WHEN properties.is_active = 1 THEN properties.price END,
+        price = excluded.price,
+        bedrooms = excluded.bedrooms,
+        bathrooms = excluded.bathrooms,
+        size_sqft = excluded.size_sqft,
+        description = excluded.description,
+        url = excluded.url,
+        raw_data = excluded.raw_data,
+        is_active = 1
+'''
+
+# Inserts new properties; an existing row is only rewritten (and returned) when its
+# hash changed or it was inactive. previous_price comes back NULL both for fresh inserts
+# and for inactive rows being relisted, so callers treat relistings as new listings.
+# Every attempt, including a no-op conflict, consumes an AUTOINCREMENT value, so ids
+# have gaps; they are only used internally (price_history), and AUTOINCREMENT is kept
+# so ids of rows removed by cleanup are never reused by orphaned history.
+_SQL_UPSERT_PROPERTY = _SQL_INSERT_PROPERTY + _SQL_UPSERT_SET + '''
+    WHERE properties.property_hash != excluded.property_hash
+    OR properties.is_active = 0
+    RETURNING id, previous_price
+'''
+
+# Stay under SQLite's default SQLITE_MAX_VARIABLE_NUMBER for multi-row inserts
+_MAX_SQL_VARIABLES = 999
+_ROWS_PER_INSERT = _MAX_SQL_VARIABLES // _PROPERTY_PLACEHOLDERS.count("?")
+
+# Rows written before the switch to BLAKE2b carry 64-character SHA-256 hex hashes. Only
+# active rows matter: inactive ones are reported as relisted if they reappear anyway.
+_SQL_SELECT_LEGACY_HASHES = '''
+    SELECT external_id, property_hash FROM properties
+    WHERE is_active = 1 AND length(property_hash) = 64
+'''
+_SQL_UPDATE_PROPERTY_HASH = 'UPDATE properties SET property_hash = ? WHERE external_id = ?'
+
+_SQL_MARK_PROPERTIES_INACTIVE = '''
+    UPDATE properties SET is_active = 0 WHERE is_active = 1 AND external_id IN ({placeholders})
+'''
+
+# Only the columns change handling and delisting notifications read
+_SQL_SELECT_PROPERTIES_BY_EXTERNAL_IDS = '''
+    SELECT external_id, id, property_hash, title, location, price, date_added, url
+    FROM properties WHERE is_active = 1 AND external_id IN ({placeholders})
+'''
+
+# Scratch table of the IDs seen in the current fetch, for diffing on the database side
+_SQL_CREATE_CURRENT_IDS = 'CREATE TEMP TABLE IF NOT EXISTS current_ids (external_id TEXT PRIMARY KEY)'
+_SQL_CLEAR_CURRENT_IDS = 'DELETE FROM current_ids'
+_SQL_INSERT_CURRENT_ID = 'INSERT OR IGNORE INTO current_ids (external_id) VALUES (?)'
+_SQL_SELECT_MISSING_ACTIVE_IDS = '''
+    SELECT external_id FROM properties
+    WHERE is_active = 1
+    AND external_id NOT IN (SELECT external_id FROM current_ids)
+'''
+
+_SQL_SELECT_CHANGES_SINCE = '''
+    SELECT 'new' AS change_type, p.*,
+           NULL AS old_price, NULL AS new_price, NULL AS change_date
+    FROM properties p
+    WHERE p.date_added >= :cutoff
+    AND p.is_active = 1
+    UNION ALL
+    SELECT 'price_changes' AS change_type, p.*,
+           ph.old_price, ph.new_price, ph.change_date
+    FROM properties p
+    JOIN price_history ph ON p.id = ph.property_id
+    WHERE ph.change_date >= :cutoff
+    AND p.is_active = 1
+    UNION ALL
+    SELECT 'deleted' AS change_type, p.*,
+           NULL AS old_price, NULL AS new_price, NULL AS change_date
+    FROM properties p
+    WHERE p.date_modified >= :cutoff
+    AND p.is_active = 0
+'''
+
+_SQL_COUNT_CHANGES_SINCE = '''
+    SELECT
+        (SELECT COUNT(*) FROM properties
+         WHERE is_active = 1 AND date_added >= :cutoff),
+        (SELECT COUNT(*) FROM properties p
+         JOIN price_history ph ON p.id = ph.property_id
+         WHERE ph.change_date >= :cutoff AND p.is_active = 1),
+        (SELECT COUNT(*) FROM properties
+         WHERE is_active = 0 AND date_modified >= :cutoff)
+'''
+
+_SQL_INSERT_MONITORING_LOG = '''
+    INSERT INTO monitoring_log (
+        source, properties_found, new_properties, 
+        updated_properties, deleted_properties, errors, status
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Queued monitoring_log records are flushed at least this often, or once a batch fills
+_LOG_FLUSH_INTERVAL = 1.0
+_LOG_BATCH_SIZE = 100
+
+# Monitoring stats only change at cycle boundaries; reuse them briefly
+_STATS_CACHE_TTL = 30
+
+_SQL_UPSERT_SCRAPER_RUN = '''
+    INSERT OR REPLACE INTO apify_runs (location, run_id, finished_at)
+    VALUES (?, ?, ?)
+'''
+
+_SQL_SELECT_SCRAPER_RUN = '''
+    SELECT run_id, finished_at FROM apify_runs WHERE location = ?
+'''
+
+_SQL_LISTING_COUNTS = '''
+    SELECT 
+        COALESCE(bedrooms, 0) AS bedrooms,
+        COALESCE(NULLIF(property_type, ''), 'Unknown') AS property_type,
+        COUNT(*) AS count,
+        SUM(CASE WHEN COALESCE(NULLIF(listing_type, ''), 'rent') = 'rent' THEN 1 ELSE 0 END) AS rent_count,
+        SUM(CASE WHEN listing_type = 'sale' THEN 1 ELSE 0 END) AS sale_count
+    FROM properties 
+    WHERE is_active = 1 
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+'''
+
+_SQL_COUNT_ACTIVE_PROPERTIES = 'SELECT COUNT(*) FROM properties WHERE is_active = 1'
+
+_SQL_SELECT_LAST_CHECK = '''
+    SELECT timestamp FROM monitoring_log 
+    ORDER BY timestamp DESC LIMIT 1
+'''
+
+# Non-unique indexes on properties, including composites matching the
+# date-range and listing-count predicates
+_SECONDARY_INDEXES = (
+    ('idx_location', 'location'),
+    ('idx_date_added', 'date_added'),
+    ('idx_active_added', 'is_active, date_added'),
+    ('idx_active_modified', 'is_active, date_modified'),
+    ('idx_bhk_agg', 'is_active, bedrooms, property_type, listing_type')
+)
+
+_CONNECTION_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA busy_timeout=5000',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-131072',
+    'PRAGMA mmap_size=268435456'
+)
+
+# Fields (with defaults) that indicate property changes
+_HASH_FIELD_DEFAULTS = (
+    ('external_id', ''),
+    ('title', ''),
+    ('price', 0),
+    ('location', ''),
+    ('bedrooms', 0),
+    ('bathrooms', 0),
+    ('size_sqft', 0)
+)
+
+def _utc_cutoff(hours: int) -> str:
+    """Format the UTC time N hours ago the way SQLite's CURRENT_TIMESTAMP stores it"""
+    return (datetime.now(timezone.utc) - timedelta(hours=hours)).strftime('%Y-%m-%d %H:%M:%S')
+
+def _serialize_raw_data(raw_data: Optional[Dict[str, Any]]) -> str:
+    """Serialize raw upstream data for storage, using orjson when available"""
+    if not raw_data:
+        return '{}'
+    if orjson is not None:
+        return orjson.dumps(raw_data).decode()
+    return json.dumps(raw_data)
+
+def _hash_property_values(values: Tuple) -> str:
+    """Hash property field values in fixed field order"""
+    # Hand the hasher a single buffer; the trailing separator keeps stored hashes stable
+    data = ''.join([f'{value}\x1f' for value in values]).encode()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def _legacy_property_hash(property_data: Dict[str, Any]) -> Optional[str]:
+    """Hash a property the way it was hashed before BLAKE2b (sorted-key JSON, SHA-256)"""
+    hash_data = {field: property_data.get(field, default) for field, default in _HASH_FIELD_DEFAULTS}
+    try:
+        hash_string = json.dumps(hash_data, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(hash_string.encode()).hexdigest()
+
 class PropertyDatabase:
     def __init__(self, db_path: str):
         self.db_path = db_path
+        
+        # One persistent connection per instance; transactions are managed in get_connection
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None,
+                                     cached_statements=256)
+        self._conn.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            self._conn.execute(pragma)
+        
+        # monitoring_log writes are batched by a background thread, started on first use
+        self._log_queue = queue.Queue()
+        self._log_thread = None
+        
+        # (monotonic timestamp, stats) for get_monitoring_stats
+        self._stats_cache = None
+        
+        # Cleared once no active rows with SHA-256 property hashes are left to convert
+        self._legacy_hashes_pending = True
+        
         self.init_database()
     
     def init_database(self):
@@ -38,10 +270,16 @@ class PropertyDatabase:
                     raw_data TEXT,
                     date_added TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     date_modified TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    is_active BOOLEAN DEFAULT 1
+                    is_active BOOLEAN DEFAULT 1,
+                    previous_price REAL
                 )
             ''')
             
+            # Older databases predate the previous_price column
+            columns = {row[1] for row in cursor.execute('PRAGMA table_info(properties)')}
+            if 'previous_price' not in columns:
+                cursor.execute('ALTER TABLE properties ADD COLUMN previous_price REAL')
+            
             # Price history table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS price_history (
@@ -54,6 +292,28 @@ class PropertyDatabase:
                 )
             ''')
             
+            # Record price changes as part of the property UPDATE itself
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_price_history
+                AFTER UPDATE OF price ON properties
+                WHEN OLD.price != NEW.price AND OLD.price > 0 AND NEW.price > 0
+                BEGIN
+                    INSERT INTO price_history (property_id, old_price, new_price)
+                    VALUES (OLD.id, OLD.price, NEW.price);
+                END
+            ''')
+            
+            # Stamp date_modified on every update unless the statement set it itself
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_touch_modified
+                AFTER UPDATE ON properties
+                WHEN NEW.date_modified IS OLD.date_modified
+                BEGIN
+                    UPDATE properties SET date_modified = CURRENT_TIMESTAMP
+                    WHERE id = NEW.id;
+                END
+            ''')
+            
             # Monitoring log table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS monitoring_log (
@@ -69,264 +329,379 @@ class PropertyDatabase:
                 )
             ''')
             
+            # Apify scraper runs, used to reuse recent datasets
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS apify_runs (
+                    location TEXT PRIMARY KEY,
+                    run_id TEXT NOT NULL,
+                    finished_at REAL NOT NULL
+                )
+            ''')
+            
             # Create indexes for better performance
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_external_id ON properties(external_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_location ON properties(location)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_is_active ON properties(is_active)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_date_added ON properties(date_added)')
+            self._create_secondary_indexes(cursor)
+            
+            # Range deletes in cleanup and the last-check lookup
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_mlog_ts ON monitoring_log(timestamp)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ph_date ON price_history(change_date)')
             
-            conn.commit()
+            # Subsumed by the composite indexes above
+            cursor.execute('DROP INDEX IF EXISTS idx_is_active')
             logger.info("Database initialized successfully")
     
+    def _create_secondary_indexes(self, cursor: sqlite3.Cursor):
+        """Create the non-unique indexes on the properties table"""
+        for name, columns in _SECONDARY_INDEXES:
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON properties({columns})')
+    
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Database error: {e}")
-            raise
-        finally:
-            conn.close()
+        """Context manager yielding the shared connection inside a transaction"""
+        with self._lock:
+            conn = self._conn
+            
+            # Nested use joins the outer transaction
+            if conn.in_transaction:
+                yield conn
+                return
+            
+            conn.execute('BEGIN')
+            try:
+                yield conn
+                if conn.in_transaction:
+                    conn.execute('COMMIT')
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.execute('ROLLBACK')
+                logger.error(f"Database error: {e}")
+                raise
+    
+    def close(self):
+        """Flush queued log records and close the database connection"""
+        self.flush_monitoring_log()
+        with self._lock:
+            self._conn.close()
     
     def generate_property_hash(self, property_data: Dict[str, Any]) -> str:
         """Generate a hash for property to detect changes"""
         # Include key fields that indicate property changes
-        hash_data = {
-            'external_id': property_data.get('external_id', ''),
-            'title': property_data.get('title', ''),
-            'price': property_data.get('price', 0),
-            'location': property_data.get('location', ''),
-            'bedrooms': property_data.get('bedrooms', 0),
-            'bathrooms': property_data.get('bathrooms', 0),
-            'size_sqft': property_data.get('size_sqft', 0)
-        }
+        values = tuple(property_data.get(field, default) for field, default in _HASH_FIELD_DEFAULTS)
+        return _hash_property_values(values)
+    
+    def _property_insert_row(self, property_data: Dict[str, Any]) -> Tuple:
+        """Build the INSERT parameters for a property"""
+        return (
+            property_data.get('external_id'),
+            self.generate_property_hash(property_data),
+            property_data.get('title'),
+            property_data.get('location'),
+            property_data.get('property_type'),
+            property_data.get('listing_type'),
+            property_data.get('price'),
+            property_data.get('bedrooms'),
+            property_data.get('bathrooms'),
+            property_data.get('size_sqft'),
+            property_data.get('description'),
+            property_data.get('url'),
+            property_data.get('source'),
+            _serialize_raw_data(property_data.get('raw_data'))
+        )
+    
+    def insert_properties_bulk(self, property_data_list: Iterable[Dict[str, Any]], 
+                               chunk_size: int = _ROWS_PER_INSERT) -> int:
+        """Insert multiple new properties in a single transaction
         
-        hash_string = json.dumps(hash_data, sort_keys=True)
-        return hashlib.sha256(hash_string.encode()).hexdigest()
+        Rows are built lazily, so only one chunk of parameters is held in memory at a time.
+        """
+        inserted = self._write_properties_bulk(property_data_list, chunk_size)
+        logger.info(f"Inserted {inserted} new properties")
+        return inserted
     
-    def insert_property(self, property_data: Dict[str, Any]) -> int:
-        """Insert a new property into the database"""
-        property_hash = self.generate_property_hash(property_data)
+    def _write_properties_bulk(self, property_data_list: Iterable[Dict[str, Any]],
+                               chunk_size: int = _ROWS_PER_INSERT, conflict_sql: str = '') -> int:
+        """Insert properties in multi-row statements, with an optional ON CONFLICT clause"""
+        rows = map(self._property_insert_row, property_data_list)
+        
+        # Full chunks go through one multi-row VALUES statement each, the remainder row by row
+        rows_per_insert = max(1, min(chunk_size, _ROWS_PER_INSERT))
+        multi_row_sql = (_SQL_INSERT_PROPERTY_PREFIX + ", ".join([_PROPERTY_PLACEHOLDERS] * rows_per_insert)
+                         + conflict_sql)
+        written = 0
         
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                INSERT INTO properties (
-                    external_id, property_hash, title, location, property_type,
-                    listing_type, price, bedrooms, bathrooms, size_sqft,
-                    description, url, source, raw_data
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                property_data.get('external_id'),
-                property_hash,
-                property_data.get('title'),
-                property_data.get('location'),
-                property_data.get('property_type'),
-                property_data.get('listing_type'),
-                property_data.get('price'),
-                property_data.get('bedrooms'),
-                property_data.get('bathrooms'),
-                property_data.get('size_sqft'),
-                property_data.get('description'),
-                property_data.get('url'),
-                property_data.get('source'),
-                json.dumps(property_data.get('raw_data', {}))
-            ))
-            
-            conn.commit()
-            property_id = cursor.lastrowid
-            logger.info(f"Inserted new property: {property_data.get('title')} (ID: {property_id})")
-            return property_id
+            while True:
+                chunk = list(islice(rows, rows_per_insert))
+                if len(chunk) < rows_per_insert:
+                    break
+                cursor.execute(multi_row_sql, list(chain.from_iterable(chunk)))
+                written += rows_per_insert
+            
+            if chunk:
+                cursor.executemany(_SQL_INSERT_PROPERTY + conflict_sql, chunk)
+                written += len(chunk)
+            return written
     
-    def update_property(self, property_id: int, property_data: Dict[str, Any]) -> bool:
-        """Update an existing property"""
-        property_hash = self.generate_property_hash(property_data)
+    def upsert_properties_bulk(self, property_data_list: Iterable[Dict[str, Any]]
+                               ) -> List[Tuple[Dict[str, Any], int, Optional[float]]]:
+        """Upsert many properties in a single transaction.
+        
+        Returns (property_data, property_id, old_price) for each inserted, relisted or
+        changed property, with old_price None for new and relisted ones. Rows that fail
+        are logged and skipped.
+        """
+        changed = []
         
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                UPDATE properties SET
-                    property_hash = ?, title = ?, location = ?, property_type = ?,
-                    listing_type = ?, price = ?, bedrooms = ?, bathrooms = ?,
-                    size_sqft = ?, description = ?, url = ?, raw_data = ?,
-                    date_modified = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (
-                property_hash,
-                property_data.get('title'),
-                property_data.get('location'),
-                property_data.get('property_type'),
-                property_data.get('listing_type'),
-                property_data.get('price'),
-                property_data.get('bedrooms'),
-                property_data.get('bathrooms'),
-                property_data.get('size_sqft'),
-                property_data.get('description'),
-                property_data.get('url'),
-                json.dumps(property_data.get('raw_data', {})),
-                property_id
-            ))
-            
-            conn.commit()
-            logger.info(f"Updated property ID: {property_id}")
-            return cursor.rowcount > 0
+            if self._legacy_hashes_pending:
+                property_data_list = list(property_data_list)
+                self._restamp_legacy_hashes(cursor, property_data_list)
+            
+            for property_data in property_data_list:
+                try:
+                    cursor.execute(_SQL_UPSERT_PROPERTY, self._property_insert_row(property_data))
+                except sqlite3.Error as e:
+                    # A failed statement is rolled back on its own; the transaction continues
+                    logger.error(f"Error saving property {property_data.get('external_id')}: {e}")
+                    continue
+                
+                row = cursor.fetchone()
+                if row is not None:
+                    changed.append((property_data, row[0], row[1]))
+        
+        return changed
+    
+    def _restamp_legacy_hashes(self, cursor: sqlite3.Cursor, property_data_list: List[Dict[str, Any]]):
+        """Convert SHA-256 hashes of unchanged properties to the current format.
+        
+        Without this the upsert would see every pre-BLAKE2b row as changed and report it
+        as updated. Rows whose data did change keep their old hash and are reported as usual.
+        Active legacy rows missing from the fetch are marked inactive by the deletion check,
+        so after one cycle none are left and the check stops running.
+        """
+        legacy_hashes = dict(cursor.execute(_SQL_SELECT_LEGACY_HASHES).fetchall())
+        if not legacy_hashes:
+            self._legacy_hashes_pending = False
+            return
+        
+        restamped = []
+        for property_data in property_data_list:
+            external_id = property_data.get('external_id')
+            legacy_hash = legacy_hashes.get(external_id)
+            if legacy_hash is not None and legacy_hash == _legacy_property_hash(property_data):
+                restamped.append((self.generate_property_hash(property_data), external_id))
+        
+        cursor.executemany(_SQL_UPDATE_PROPERTY_HASH, restamped)
+        if restamped:
+            logger.info(f"Converted {len(restamped)} legacy property hashes")
     
-    def record_price_change(self, property_id: int, old_price: float, new_price: float):
-        """Record a price change in the price history table"""
+    def bulk_seed(self, property_data_list: Iterable[Dict[str, Any]]) -> int:
+        """Bulk load properties for a full refresh, building secondary indexes afterwards.
+        
+        Properties already in the table are overwritten and reactivated. Foreign key
+        enforcement is never enabled on this connection (and the pragma is a no-op inside
+        a transaction), so there is nothing to switch off for the load.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                INSERT INTO price_history (property_id, old_price, new_price)
-                VALUES (?, ?, ?)
-            ''', (property_id, old_price, new_price))
+            # Index maintenance per row is skipped; the unique constraints stay in place for dedup
+            for name, _ in _SECONDARY_INDEXES:
+                cursor.execute(f'DROP INDEX IF EXISTS {name}')
             
-            conn.commit()
-            logger.info(f"Recorded price change for property {property_id}: {old_price} -> {new_price}")
+            seeded = self._write_properties_bulk(property_data_list, conflict_sql=_SQL_UPSERT_SET)
+            
+            self._create_secondary_indexes(cursor)
+            logger.info(f"Bulk seeded {seeded} properties")
+            return seeded
     
-    def mark_property_inactive(self, external_id: str) -> bool:
-        """Mark a property as inactive (delisted)"""
+    def mark_properties_inactive_bulk(self, external_ids: Iterable[str]) -> int:
+        """Mark many properties inactive in one transaction, returning how many changed"""
+        external_ids = list(external_ids)
+        marked = 0
+        
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                UPDATE properties SET
-                    is_active = 0,
-                    date_modified = CURRENT_TIMESTAMP
-                WHERE external_id = ?
-            ''', (external_id,))
-            
-            conn.commit()
-            if cursor.rowcount > 0:
-                logger.info(f"Marked property as inactive: {external_id}")
-                return True
-            return False
+            for start in range(0, len(external_ids), _MAX_SQL_VARIABLES):
+                chunk = external_ids[start:start + _MAX_SQL_VARIABLES]
+                sql = _SQL_MARK_PROPERTIES_INACTIVE.format(placeholders=", ".join("?" * len(chunk)))
+                cursor.execute(sql, chunk)
+                marked += cursor.rowcount
+        
+        if marked:
+            logger.info(f"Marked {marked} properties as inactive")
+        return marked
     
-    def get_property_by_external_id(self, external_id: str) -> Optional[Dict[str, Any]]:
-        """Get property by external ID"""
+    def get_properties_by_external_ids(self, external_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Get active properties for many external IDs, keyed by external ID"""
+        external_ids = list(external_ids)
+        results = {}
+        
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            # Plain tuples on this bulk path; each row becomes one small dict below
+            cursor.row_factory = None
             
-            cursor.execute('''
-                SELECT * FROM properties WHERE external_id = ? AND is_active = 1
-            ''', (external_id,))
-            
-            row = cursor.fetchone()
-            if row:
-                return dict(row)
-            return None
+            # One IN (...) query per chunk of IDs, within the SQL variable limit
+            for start in range(0, len(external_ids), _MAX_SQL_VARIABLES):
+                chunk = external_ids[start:start + _MAX_SQL_VARIABLES]
+                sql = _SQL_SELECT_PROPERTIES_BY_EXTERNAL_IDS.format(placeholders=", ".join("?" * len(chunk)))
+                cursor.execute(sql, chunk)
+                columns = [description[0] for description in cursor.description]
+                for row in cursor:
+                    results[row[0]] = dict(zip(columns, row))
+        
+        return results
     
-    def get_active_external_ids(self) -> List[str]:
-        """Get all active property external IDs"""
+    def diff_active_ids(self, current_ids: Iterable[str]) -> Set[str]:
+        """Get active external IDs that are absent from current_ids, diffed in SQL"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('SELECT external_id FROM properties WHERE is_active = 1')
-            return [row[0] for row in cursor.fetchall()]
+            cursor.execute(_SQL_CREATE_CURRENT_IDS)
+            cursor.execute(_SQL_CLEAR_CURRENT_IDS)
+            cursor.executemany(_SQL_INSERT_CURRENT_ID, ((external_id,) for external_id in current_ids))
+            
+            cursor.execute(_SQL_SELECT_MISSING_ACTIVE_IDS)
+            missing = {row[0] for row in cursor}
+            
+            cursor.execute(_SQL_CLEAR_CURRENT_IDS)
+            return missing
     
-    def get_properties_by_date_range(self, hours: int) -> Dict[str, List[Dict[str, Any]]]:
-        """Get properties added, updated, or deleted in the last N hours"""
+    def get_properties_by_date_range(self, hours: int) -> Dict[str, List[sqlite3.Row]]:
+        """Get properties added, updated, or deleted in the last N hours
+        
+        Rows keep the change_type, old_price, new_price and change_date columns;
+        the price fields are NULL outside 'price_changes'.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            # New properties
-            cursor.execute('''
-                SELECT * FROM properties 
-                WHERE date_added >= datetime('now', '-{} hours')
-                AND is_active = 1
-            '''.format(hours))
-            new_properties = [dict(row) for row in cursor.fetchall()]
+            # New properties, price changes and deleted (inactive) properties in one round-trip
+            cursor.execute(_SQL_SELECT_CHANGES_SINCE, {'cutoff': _utc_cutoff(hours)})
             
-            # Price changes
-            cursor.execute('''
-                SELECT p.*, ph.old_price, ph.new_price, ph.change_date
-                FROM properties p
-                JOIN price_history ph ON p.id = ph.property_id
-                WHERE ph.change_date >= datetime('now', '-{} hours')
-                AND p.is_active = 1
-            '''.format(hours))
-            price_changes = [dict(row) for row in cursor.fetchall()]
-            
-            # Deleted properties (marked inactive)
-            cursor.execute('''
-                SELECT * FROM properties 
-                WHERE date_modified >= datetime('now', '-{} hours')
-                AND is_active = 0
-            '''.format(hours))
-            deleted_properties = [dict(row) for row in cursor.fetchall()]
+            results = {'new': [], 'price_changes': [], 'deleted': []}
+            for row in cursor.fetchall():
+                results[row['change_type']].append(row)
             
+            return results
+    
+    def get_recent_counts(self, hours: int) -> Dict[str, int]:
+        """Count properties added, price-changed, or deleted in the last N hours"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(_SQL_COUNT_CHANGES_SINCE, {'cutoff': _utc_cutoff(hours)})
+            
+            new_count, price_change_count, deleted_count = cursor.fetchone()
             return {
-                'new': new_properties,
-                'price_changes': price_changes,
-                'deleted': deleted_properties
+                'new': new_count,
+                'price_changes': price_change_count,
+                'deleted': deleted_count
             }
     
     def log_monitoring_run(self, source: str, properties_found: int, 
                           new_properties: int, updated_properties: int, 
                           deleted_properties: int, errors: str = None, 
                           status: str = "success"):
-        """Log a monitoring run"""
+        """Queue a monitoring run record for the background log writer"""
+        # A finished run changes the stats
+        self._stats_cache = None
+        self._log_queue.put((source, properties_found, new_properties, 
+                             updated_properties, deleted_properties, errors, status))
+        
+        if self._log_thread is None:
+            with self._lock:
+                if self._log_thread is None:
+                    self._log_thread = threading.Thread(target=self._log_writer,
+                                                        name='monitoring-log-writer', daemon=True)
+                    self._log_thread.start()
+    
+    def _log_writer(self):
+        """Drain the log queue, writing records in batches"""
+        while True:
+            batch = [self._log_queue.get()]
+            deadline = time.monotonic() + _LOG_FLUSH_INTERVAL
+            while len(batch) < _LOG_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._log_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write_log_batch(batch)
+            for _ in batch:
+                self._log_queue.task_done()
+    
+    def _write_log_batch(self, batch: List[Tuple]):
+        """Insert a batch of monitoring_log records"""
+        try:
+            with self.get_connection() as conn:
+                conn.executemany(_SQL_INSERT_MONITORING_LOG, batch)
+        except sqlite3.Error as e:
+            logger.error(f"Error writing {len(batch)} monitoring log records: {e}")
+    
+    def flush_monitoring_log(self):
+        """Synchronously write queued log records, waiting for any batch in flight.
+        
+        Must not be called while holding the connection lock, since the writer
+        thread needs it to finish its batch.
+        """
+        batch = []
+        while True:
+            try:
+                batch.append(self._log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write_log_batch(batch)
+            for _ in batch:
+                self._log_queue.task_done()
+        
+        self._log_queue.join()
+    
+    def record_scraper_run(self, location: str, run_id: str):
+        """Record the latest successful scraper run for a location"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                INSERT INTO monitoring_log (
-                    source, properties_found, new_properties, 
-                    updated_properties, deleted_properties, errors, status
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (source, properties_found, new_properties, 
-                  updated_properties, deleted_properties, errors, status))
-            
-            conn.commit()
+            cursor.execute(_SQL_UPSERT_SCRAPER_RUN, (location, run_id, time.time()))
+    
+    def get_last_scraper_run(self, location: str) -> Optional[sqlite3.Row]:
+        """Get the latest successful scraper run for a location"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(_SQL_SELECT_SCRAPER_RUN, (location,))
+            return cursor.fetchone()
     
     def get_current_listing_counts(self) -> Dict[str, Any]:
         """Get current listing counts by bedroom type"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            # Get counts by bedroom type
-            cursor.execute('''
-                SELECT 
-                    bedrooms,
-                    COUNT(*) as count,
-                    property_type,
-                    listing_type
-                FROM properties 
-                WHERE is_active = 1 
-                GROUP BY bedrooms, property_type, listing_type
-                ORDER BY bedrooms, property_type
-            ''')
-            
-            results = cursor.fetchall()
+            # Get counts by bedroom type, with the rent/sale split done in SQL
+            cursor.execute(_SQL_LISTING_COUNTS)
             
             # Organize data
             bedroom_counts = {}
             total_count = 0
             
-            for row in results:
-                bedrooms = row[0] or 0
-                count = row[1]
-                prop_type = row[2] or 'Unknown'
-                listing_type = row[3] or 'rent'
-                
+            for bedrooms, prop_type, count, rent_count, sale_count in cursor.fetchall():
                 total_count += count
                 
                 key = f"{bedrooms}BHK" if bedrooms > 0 else "Studio"
-                if key not in bedroom_counts:
-                    bedroom_counts[key] = {'total': 0, 'rent': 0, 'sale': 0, 'types': {}}
-                
-                bedroom_counts[key]['total'] += count
-                bedroom_counts[key][listing_type] += count
-                
-                if prop_type not in bedroom_counts[key]['types']:
-                    bedroom_counts[key]['types'][prop_type] = 0
-                bedroom_counts[key]['types'][prop_type] += count
+                entry = bedroom_counts.setdefault(key, {'total': 0, 'rent': 0, 'sale': 0, 'types': {}})
+                entry['total'] += count
+                entry['rent'] += rent_count
+                entry['sale'] += sale_count
+                entry['types'][prop_type] = entry['types'].get(prop_type, 0) + count
             
             return {
                 'total_active': total_count,
@@ -335,29 +710,36 @@ class PropertyDatabase:
             }
 
     def get_monitoring_stats(self) -> Dict[str, Any]:
-        """Get monitoring statistics"""
+        """Get monitoring statistics, cached for _STATS_CACHE_TTL seconds"""
+        cached = self._stats_cache
+        if cached and time.monotonic() - cached[0] < _STATS_CACHE_TTL:
+            return dict(cached[1])
+        
+        # Make the most recent run visible to the last-check query
+        self.flush_monitoring_log()
+        
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
             # Total active properties
-            cursor.execute('SELECT COUNT(*) FROM properties WHERE is_active = 1')
+            cursor.execute(_SQL_COUNT_ACTIVE_PROPERTIES)
             total_properties = cursor.fetchone()[0]
             
             # Last monitoring run
-            cursor.execute('''
-                SELECT timestamp FROM monitoring_log 
-                ORDER BY timestamp DESC LIMIT 1
-            ''')
+            cursor.execute(_SQL_SELECT_LAST_CHECK)
             last_check_row = cursor.fetchone()
             last_check = last_check_row[0] if last_check_row else "Never"
             
             # Recent activity (24 hours)
-            recent_data = self.get_properties_by_date_range(24)
+            recent_counts = self.get_recent_counts(24)
             
-            return {
+            stats = {
                 'total_properties': total_properties,
                 'last_check': last_check,
-                'new_today': len(recent_data['new']),
-                'price_changes_today': len(recent_data['price_changes']),
-                'deletions_today': len(recent_data['deleted'])
+                'new_today': recent_counts['new'],
+                'price_changes_today': recent_counts['price_changes'],
+                'deletions_today': recent_counts['deleted']
             }
+        
+        self._stats_cache = (time.monotonic(), stats)
+        return dict(stats)
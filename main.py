@@ -1,14 +1,16 @@
+import sys
+from scheduler import PropertyMonitorScheduler
+from utils import setup_logging
+from config import LOG_LEVEL
 
-import time
-from wasl_scraper import scrape_properties
-from property_monitor import detect_changes_and_notify
+def main():
+    setup_logging(LOG_LEVEL)
 
-while True:
-    try:
-        print("⏳ Checking Wasl website...")
-        listings = scrape_properties()
-        detect_changes_and_notify(listings)
-        print("✅ Check complete.")
-    except Exception as e:
-        print(f"❌ Error occurred: {e}")
-    time.sleep(120)  # 2-minute interval
+    # The scheduler owns all timing; --once runs a single check without scheduling
+    scheduler = PropertyMonitorScheduler()
+    if "--once" in sys.argv[1:]:
+        return 0 if scheduler.run_once() else 1
+    return 0 if scheduler.start() else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
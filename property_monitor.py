@@ -11,13 +11,21 @@ logger = logging.getLogger(__name__)
 class PropertyMonitor:
     def __init__(self, db_path: str):
         self.db = PropertyDatabase(db_path)
-        self.api_manager = PropertyAPIManager()
-        self.telegram = TelegramNotifier()
+        # Share one database connection across all components
+        self.api_manager = PropertyAPIManager(db=self.db)
+        self.telegram = TelegramNotifier(db=self.db)
         self.consecutive_errors = 0
+        
+        # Notification messages buffered during a cycle and sent together at the end
+        self._pending_notifications: List[str] = []
+        
+        # Timestamp shown in this cycle's notifications, formatted once per cycle
+        self._cycle_now_str = None
     
     def run_monitoring_cycle(self) -> Dict[str, int]:
         """Run a complete monitoring cycle"""
         logger.info("Starting property monitoring cycle")
+        self._cycle_now_str = datetime.now().strftime('%Y-%m-%d %H:%M')
         
         try:
             # Fetch latest properties from APIs
@@ -27,11 +35,12 @@ class PropertyMonitor:
                 logger.warning("No properties fetched from APIs")
                 self.consecutive_errors += 1
                 if self.consecutive_errors >= ERROR_NOTIFICATION_THRESHOLD:
-                    self.telegram.send_error_notification("No properties found in multiple consecutive runs")
+                    self.telegram.send_error_notification("No properties found in multiple consecutive runs", self._cycle_now_str)
                 return {"found": 0, "new": 0, "updated": 0, "deleted": 0}
             
             # Reset error counter on successful fetch
             self.consecutive_errors = 0
+            self._pending_notifications = []
             
             # Process properties and detect changes
             stats = self._process_properties(current_properties)
@@ -40,6 +49,9 @@ class PropertyMonitor:
             deleted_count = self._check_for_deleted_properties(current_properties)
             stats["deleted"] = deleted_count
             
+            # Dispatch this cycle's notifications off the monitoring thread
+            self._send_pending_notifications()
+            
             # Log monitoring run
             self.db.log_monitoring_run(
                 source="combined_apis",
@@ -57,7 +69,7 @@ class PropertyMonitor:
             self.consecutive_errors += 1
             
             if self.consecutive_errors >= ERROR_NOTIFICATION_THRESHOLD:
-                self.telegram.send_error_notification(f"Monitoring cycle failed: {str(e)}")
+                self.telegram.send_error_notification(f"Monitoring cycle failed: {str(e)}", self._cycle_now_str)
             
             # Log error in database
             self.db.log_monitoring_run(
@@ -77,101 +89,84 @@ class PropertyMonitor:
         new_count = 0
         updated_count = 0
         
+        valid_properties = []
         for property_data in current_properties:
-            external_id = property_data.get("external_id")
-            if not external_id:
+            if not property_data.get("external_id"):
                 logger.warning("Property missing external_id, skipping")
                 continue
-            
-            # Check if property exists in database
-            existing_property = self.db.get_property_by_external_id(external_id)
-            
-            if existing_property:
-                # Check for changes
-                if self._has_property_changed(existing_property, property_data):
-                    updated_count += 1
-                    self._handle_property_update(existing_property, property_data)
-            else:
-                # New property
+            valid_properties.append(property_data)
+        
+        # Write everything in one transaction; unchanged properties are not returned
+        changed = self.db.upsert_properties_bulk(valid_properties)
+        
+        # Listings summaries built from here on reflect this cycle's writes
+        self.telegram.invalidate_listings_summary()
+        
+        # Notify once the database work is done
+        for property_data, property_id, old_price in changed:
+            if old_price is None:
+                # New property, or a delisted one that reappeared
                 new_count += 1
                 self._handle_new_property(property_data)
+            else:
+                updated_count += 1
+                self._handle_property_update(property_data, old_price)
         
         return {"found": len(current_properties), "new": new_count, "updated": updated_count}
     
-    def _has_property_changed(self, existing: Dict[str, Any], current: Dict[str, Any]) -> bool:
-        """Check if property has significant changes"""
-        # Generate hashes to compare
-        existing_hash = self.db.generate_property_hash(existing)
-        current_hash = self.db.generate_property_hash(current)
-        
-        return existing_hash != current_hash
-    
     def _handle_new_property(self, property_data: Dict[str, Any]):
         """Handle new property discovery"""
         try:
-            property_id = self.db.insert_property(property_data)
-            
-            # Send Telegram notification
-            success = self.telegram.send_new_listing_notification(property_data)
-            if success:
-                logger.info(f"Sent new listing notification for property: {property_data.get('title')}")
-            else:
-                logger.warning(f"Failed to send notification for new property: {property_data.get('title')}")
+            self._pending_notifications.append(
+                self.telegram.format_new_listing_message(property_data, self._cycle_now_str)
+            )
                 
         except Exception as e:
             logger.error(f"Error handling new property: {e}")
     
-    def _handle_property_update(self, existing: Dict[str, Any], updated: Dict[str, Any]):
-        """Handle property update"""
+    def _handle_property_update(self, updated: Dict[str, Any], old_price: float):
+        """Handle property update (price history is recorded by a database trigger)"""
         try:
-            property_id = existing["id"]
-            old_price = existing.get("price", 0)
             new_price = updated.get("price", 0)
             
-            # Update property in database
-            self.db.update_property(property_id, updated)
-            
             # Check for price change
             if old_price != new_price and old_price > 0 and new_price > 0:
-                # Record price change
-                self.db.record_price_change(property_id, old_price, new_price)
-                
-                # Send notification
-                success = self.telegram.send_price_change_notification(updated, old_price, new_price)
-                if success:
-                    logger.info(f"Sent price change notification for property: {updated.get('title')}")
-                else:
-                    logger.warning(f"Failed to send price change notification for property: {updated.get('title')}")
+                self._pending_notifications.append(
+                    self.telegram.format_price_change_message(updated, old_price, new_price)
+                )
                     
         except Exception as e:
             logger.error(f"Error handling property update: {e}")
     
+    def _send_pending_notifications(self):
+        """Hand this cycle's notifications to the background Telegram sender"""
+        notifications, self._pending_notifications = self._pending_notifications, []
+        if not notifications:
+            return
+        
+        self.telegram.queue_messages(notifications)
+        logger.info(f"Queued {len(notifications)} notifications")
+    
     def _check_for_deleted_properties(self, current_properties: List[Dict[str, Any]]) -> int:
         """Check for properties that have been delisted"""
         try:
             # Get current external IDs
             current_external_ids = {prop.get("external_id") for prop in current_properties if prop.get("external_id")}
             
-            # Get all active external IDs from database
-            active_external_ids = set(self.db.get_active_external_ids())
+            # Find deleted properties: active in the database but absent from this fetch
+            deleted_external_ids = self.db.diff_active_ids(current_external_ids)
             
-            # Find deleted properties
-            deleted_external_ids = active_external_ids - current_external_ids
+            # Fetch all delisted rows in one batched lookup
+            deleted_properties = self.db.get_properties_by_external_ids(deleted_external_ids)
             
-            deleted_count = 0
-            for external_id in deleted_external_ids:
-                deleted_property = self.db.get_property_by_external_id(external_id)
-                if deleted_property:
-                    # Mark as inactive
-                    self.db.mark_property_inactive(external_id)
-                    deleted_count += 1
-                    
-                    # Send notification
-                    success = self.telegram.send_deleted_listing_notification(deleted_property)
-                    if success:
-                        logger.info(f"Sent deletion notification for property: {deleted_property.get('title')}")
-                    else:
-                        logger.warning(f"Failed to send deletion notification for property: {deleted_property.get('title')}")
+            # Mark them all inactive in one statement per chunk
+            deleted_count = self.db.mark_properties_inactive_bulk(deleted_properties)
+            
+            # Queue notifications
+            for deleted_property in deleted_properties.values():
+                self._pending_notifications.append(
+                    self.telegram.format_deleted_listing_message(deleted_property, self._cycle_now_str)
+                )
             
             return deleted_count
             
@@ -1,7 +1,9 @@
 import logging
+import threading
 import time
 from datetime import datetime, timedelta
-from apscheduler.schedulers.blocking import BlockingScheduler
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
 from property_monitor import PropertyMonitor
@@ -14,7 +16,12 @@ logger = logging.getLogger(__name__)
 
 class PropertyMonitorScheduler:
     def __init__(self):
-        self.scheduler = BlockingScheduler()
+        # Jobs run on a small pool so reports and cleanup never hold up monitoring
+        self.scheduler = BackgroundScheduler(
+            executors={'default': ThreadPoolExecutor(4)},
+            job_defaults={'coalesce': True, 'max_instances': 1}
+        )
+        self._stop_event = threading.Event()
         self.monitor = PropertyMonitor(DATABASE_PATH)
         self.consecutive_errors = 0
         
@@ -113,16 +120,16 @@ class PropertyMonitorScheduler:
             
             # Get 24-hour statistics
             stats = self.monitor.db.get_monitoring_stats()
-            recent_data = self.monitor.db.get_properties_by_date_range(24)
+            recent_counts = self.monitor.db.get_recent_counts(24)
             
             summary_message = f"""
 📊 *DAILY PROPERTY SUMMARY*
 📅 Date: {datetime.now().strftime('%Y-%m-%d')}
 
 📈 *24-Hour Activity:*
-🆕 New Listings: {len(recent_data['new'])}
-💰 Price Changes: {len(recent_data['price_changes'])}
-❌ Deletions: {len(recent_data['deleted'])}
+🆕 New Listings: {recent_counts['new']}
+💰 Price Changes: {recent_counts['price_changes']}
+❌ Deletions: {recent_counts['deleted']}
 
 📋 *Total Active Properties:* {stats['total_properties']}
 ⏰ *Last Monitoring Check:* {stats['last_check']}
@@ -165,8 +172,6 @@ class PropertyMonitorScheduler:
                 ''')
                 inactive_deleted = cursor.rowcount
                 
-                conn.commit()
-                
                 cleanup_message = f"""
 🧹 *DATABASE CLEANUP COMPLETED*
 
@@ -177,9 +182,10 @@ class PropertyMonitorScheduler:
 
 ⏰ *Completed:* {datetime.now().strftime('%Y-%m-%d %H:%M')}
 """
-                
-                self.monitor.telegram.send_message(cleanup_message)
-                logger.info(f"Database cleanup completed: {logs_deleted} logs, {price_history_deleted} price history, {inactive_deleted} inactive properties deleted")
+            
+            # Notify only after the transaction has committed and released the connection
+            self.monitor.telegram.send_message(cleanup_message)
+            logger.info(f"Database cleanup completed: {logs_deleted} logs, {price_history_deleted} price history, {inactive_deleted} inactive properties deleted")
                 
         except Exception as e:
             logger.error(f"Error during database cleanup: {e}")
@@ -200,9 +206,10 @@ class PropertyMonitorScheduler:
             logger.info("Running initial monitoring cycle")
             self.run_monitoring_job()
             
-            # Start scheduler
+            # Start scheduler and keep the main thread alive until stopped
             logger.info("Starting property monitoring scheduler")
             self.scheduler.start()
+            self._stop_event.wait()
             
         except KeyboardInterrupt:
             logger.info("Scheduler stopped by user")
@@ -217,8 +224,11 @@ class PropertyMonitorScheduler:
         """Stop the scheduler gracefully"""
         try:
             logger.info("Stopping scheduler")
+            self._stop_event.set()
             if self.scheduler.running:
                 self.scheduler.shutdown(wait=True)
+            
+            self._finish_pending_work()
             logger.info("Scheduler stopped successfully")
             
         except Exception as e:
@@ -242,3 +252,15 @@ class PropertyMonitorScheduler:
         except Exception as e:
             logger.error(f"Error in one-time monitoring: {e}")
             return False
+        finally:
+            try:
+                self._finish_pending_work()
+            except Exception as e:
+                logger.error(f"Error finishing pending work: {e}")
+    
+    def _finish_pending_work(self):
+        """Deliver queued notifications and persist queued log records before exit"""
+        self.monitor.telegram.wait_for_queued_messages()
+        
+        # Closing the database flushes the background monitoring-log writer
+        self.monitor.db.close()
@@ -1,10 +1,18 @@
 import asyncio
 import logging
-from typing import List, Dict, Any
+import queue
+import threading
+import time
+import string
+from functools import lru_cache
+from typing import List, Dict, Any, Callable, Optional
 from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import (
-    TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID,
+    TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, TELEGRAM_CHAT_SEND_INTERVAL, LISTINGS_SUMMARY_TTL,
+    TELEGRAM_QUEUE_SIZE, TELEGRAM_BATCH_SIZE, TELEGRAM_BATCH_WAIT,
     NEW_LISTING_TEMPLATE, PRICE_CHANGE_TEMPLATE, 
     DELETED_LISTING_TEMPLATE, STATUS_REPORT_TEMPLATE
 )
@@ -14,26 +22,77 @@ from config import DATABASE_PATH
 
 logger = logging.getLogger(__name__)
 
+def _compile_template(template: str) -> Callable[..., str]:
+    """Compile a str.format template into an equivalent f-string renderer, parsed once"""
+    parts = []
+    fields = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        parts.append(literal.replace('{', '{{').replace('}', '}}'))
+        if field is not None:
+            if field not in fields:
+                fields.append(field)
+            parts.append('{' + field + (f'!{conversion}' if conversion else '') + (f':{spec}' if spec else '') + '}')
+    
+    source = f"def render(*, {', '.join(fields)}, **_):\n    return f{''.join(parts)!r}\n"
+    namespace = {}
+    exec(compile(source, '<template>', 'exec'), namespace)
+    return namespace['render']
+
+_render_new_listing = _compile_template(NEW_LISTING_TEMPLATE)
+_render_price_change = _compile_template(PRICE_CHANGE_TEMPLATE)
+_render_deleted_listing = _compile_template(DELETED_LISTING_TEMPLATE)
+_render_status_report = _compile_template(STATUS_REPORT_TEMPLATE)
+
+def _now_str() -> str:
+    """Current local time in the minute resolution used by notifications"""
+    return datetime.now().strftime('%Y-%m-%d %H:%M')
+
+@lru_cache(maxsize=64)
+def _title_case(value: str) -> str:
+    """Title-case a property type; only a handful of distinct values occur"""
+    return value.title()
+
 class TelegramNotifier:
-    def __init__(self):
+    def __init__(self, db: Optional[PropertyDatabase] = None):
         self.bot_token = TELEGRAM_BOT_TOKEN
         self.chat_id = TELEGRAM_CHAT_ID
         self.api_url = f"https://api.telegram.org/bot{self.bot_token}"
-        self.db = PropertyDatabase(DATABASE_PATH)
+        self._send_url = f"{self.api_url}/sendMessage"
+        self.db = db or PropertyDatabase(DATABASE_PATH)
+        
+        # (monotonic timestamp, summary) reused across notifications in one cycle
+        self._listings_summary_cache = None
+        
+        # Keep-alive session so bursts of notifications reuse one TLS connection
+        self._session = requests.Session()
+        # Only idempotent requests are retried; re-sending a sendMessage POST after a timeout
+        # or 5xx could deliver the same alert twice
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+        
+        # All messages go to one chat: send them one at a time, in order, paced to the
+        # per-chat rate limit. The send lock keeps the parts of a split message together.
+        self._send_lock = threading.Lock()
+        self._pace_lock = threading.Lock()
+        self._next_send_at = 0.0
+        
+        # Notifications queued for the background sender, started on first use
+        self._queue = queue.Queue(maxsize=TELEGRAM_QUEUE_SIZE)
+        self._worker_thread = None
+        self._worker_lock = threading.Lock()
     
     def send_message(self, message: str, parse_mode: str = "Markdown") -> bool:
         """Send a message to Telegram chat"""
         try:
-            url = f"{self.api_url}/sendMessage"
-            
             # Split long messages if necessary
             max_length = 4096
-            if len(message) > max_length:
-                messages = self._split_message(message, max_length)
-                for msg in messages:
-                    self._send_single_message(msg, parse_mode)
-            else:
-                return self._send_single_message(message, parse_mode)
+            with self._send_lock:
+                if len(message) > max_length:
+                    messages = self._split_message(message, max_length)
+                    for msg in messages:
+                        self._send_single_message(msg, parse_mode)
+                else:
+                    return self._send_single_message(message, parse_mode)
             
             return True
             
@@ -41,6 +100,69 @@ class TelegramNotifier:
             logger.error(f"Error sending Telegram message: {e}")
             return False
     
+    def send_messages_bulk(self, messages: List[str]) -> int:
+        """Send messages in order, returning how many were delivered"""
+        if not messages:
+            return 0
+        
+        sent = sum(self.send_message(message) for message in messages)
+        if sent < len(messages):
+            logger.warning(f"Failed to send {len(messages) - sent} of {len(messages)} notifications")
+        return sent
+    
+    def queue_messages(self, messages: List[str]):
+        """Hand messages to the background sender, sending inline if the queue is full"""
+        self._start_worker()
+        for message in messages:
+            try:
+                self._queue.put_nowait(message)
+            except queue.Full:
+                logger.warning("Notification queue full, sending inline")
+                self.send_message(message)
+    
+    def wait_for_queued_messages(self):
+        """Block until every queued message has been sent"""
+        self._queue.join()
+    
+    def _start_worker(self):
+        """Start the background sender thread if it is not running yet"""
+        with self._worker_lock:
+            if self._worker_thread is None:
+                self._worker_thread = threading.Thread(target=self._worker, name='telegram-sender', daemon=True)
+                self._worker_thread.start()
+    
+    def _worker(self):
+        """Send queued messages in batches of up to TELEGRAM_BATCH_SIZE"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + TELEGRAM_BATCH_WAIT
+            while len(batch) < TELEGRAM_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            try:
+                self.send_messages_bulk(batch)
+            except Exception as e:
+                logger.error(f"Error sending queued notifications: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    def _wait_for_send_slot(self):
+        """Block until the per-chat rate limit allows another message"""
+        with self._pace_lock:
+            now = time.monotonic()
+            wait = self._next_send_at - now
+            self._next_send_at = max(now, self._next_send_at) + TELEGRAM_CHAT_SEND_INTERVAL
+        
+        if wait > 0:
+            time.sleep(wait)
+    
     def _send_single_message(self, message: str, parse_mode: str = "Markdown") -> bool:
         """Send a single message to Telegram"""
         try:
@@ -51,7 +173,8 @@ class TelegramNotifier:
                 "disable_web_page_preview": True
             }
             
-            response = requests.post(f"{self.api_url}/sendMessage", data=data, timeout=30)
+            self._wait_for_send_slot()
+            response = self._session.post(self._send_url, data=data, timeout=30)
             response.raise_for_status()
             
             return True
@@ -61,131 +184,143 @@ class TelegramNotifier:
             return False
     
     def _split_message(self, message: str, max_length: int) -> List[str]:
-        """Split long message into chunks"""
+        """Split long message into chunks, breaking at the last newline that fits"""
         messages = []
-        current_message = ""
-        
-        lines = message.split('\n')
-        for line in lines:
-            if len(current_message + line + '\n') > max_length:
-                if current_message:
-                    messages.append(current_message.strip())
-                    current_message = line + '\n'
-                else:
-                    # Line is too long, split it
-                    while len(line) > max_length:
-                        messages.append(line[:max_length])
-                        line = line[max_length:]
-                    current_message = line + '\n'
-            else:
-                current_message += line + '\n'
+        start = 0
+        length = len(message)
         
-        if current_message:
-            messages.append(current_message.strip())
+        while start < length:
+            end = min(start + max_length, length)
+            cut = message.rfind('\n', start, end) if end < length else end
+            if cut <= start:
+                # Line is too long (or no newline fits), split it
+                cut = end
+            chunk = message[start:cut].strip()
+            if chunk:
+                messages.append(chunk)
+            start = cut + 1 if cut < length and message[cut] == '\n' else cut
         
         return messages
 
     def _get_current_listings_summary(self) -> str:
-        """Get formatted current listings summary"""
+        """Get formatted current listings summary, cached for LISTINGS_SUMMARY_TTL seconds"""
+        cached = self._listings_summary_cache
+        if cached and time.monotonic() - cached[0] < LISTINGS_SUMMARY_TTL:
+            return cached[1]
+        
         try:
             listing_counts = self.db.get_current_listing_counts()
-            return format_current_listings_summary(listing_counts)
+            summary = format_current_listings_summary(listing_counts)
         except Exception as e:
             logger.error(f"Error getting current listings summary: {e}")
             return "Current listings data unavailable"
+        
+        self._listings_summary_cache = (time.monotonic(), summary)
+        return summary
+    
+    def invalidate_listings_summary(self):
+        """Drop the cached listings summary so the next message recomputes it"""
+        self._listings_summary_cache = None
     
-    def send_new_listing_notification(self, property_data: Dict[str, Any]) -> bool:
+    def format_new_listing_message(self, property_data: Dict[str, Any], now_str: Optional[str] = None) -> str:
+        """Build the notification message for a new property listing"""
+        # Format price
+        price = property_data.get('price', 0)
+        price_formatted = f"{price:,.0f}" if price else "Price on request"
+        
+        # Format size
+        size = property_data.get('size_sqft', 0)
+        size_formatted = f"{size:,.0f}" if size else "N/A"
+        
+        # Format bedrooms/bathrooms
+        bedrooms = property_data.get('bedrooms', 0) or "N/A"
+        bathrooms = property_data.get('bathrooms', 0) or "N/A"
+        
+        # Truncate description
+        description = property_data.get('description', 'No description available')
+        if len(description) > 200:
+            description = description[:200] + "..."
+        
+        # Get current listings summary
+        current_listings = self._get_current_listings_summary()
+        
+        return _render_new_listing(
+            location=property_data.get('location', 'Unknown'),
+            property_type=_title_case(property_data.get('property_type', 'Unknown')),
+            price=price_formatted,
+            bedrooms=bedrooms,
+            bathrooms=bathrooms,
+            size=size_formatted,
+            url=property_data.get('url', 'N/A'),
+            description=description,
+            current_listings=current_listings,
+            date_added=now_str or _now_str()
+        )
+    
+    def send_new_listing_notification(self, property_data: Dict[str, Any], now_str: Optional[str] = None) -> bool:
         """Send notification for new property listing"""
         try:
-            # Format price
-            price = property_data.get('price', 0)
-            price_formatted = f"{price:,.0f}" if price else "Price on request"
-            
-            # Format size
-            size = property_data.get('size_sqft', 0)
-            size_formatted = f"{size:,.0f}" if size else "N/A"
-            
-            # Format bedrooms/bathrooms
-            bedrooms = property_data.get('bedrooms', 0) or "N/A"
-            bathrooms = property_data.get('bathrooms', 0) or "N/A"
-            
-            # Truncate description
-            description = property_data.get('description', 'No description available')
-            if len(description) > 200:
-                description = description[:200] + "..."
-            
-            # Get current listings summary
-            current_listings = self._get_current_listings_summary()
-            
-            message = NEW_LISTING_TEMPLATE.format(
-                location=property_data.get('location', 'Unknown'),
-                property_type=property_data.get('property_type', 'Unknown').title(),
-                price=price_formatted,
-                bedrooms=bedrooms,
-                bathrooms=bathrooms,
-                size=size_formatted,
-                url=property_data.get('url', 'N/A'),
-                description=description,
-                current_listings=current_listings,
-                date_added=datetime.now().strftime('%Y-%m-%d %H:%M')
-            )
-            
-            return self.send_message(message)
+            return self.send_message(self.format_new_listing_message(property_data, now_str))
             
         except Exception as e:
             logger.error(f"Error sending new listing notification: {e}")
             return False
     
+    def format_price_change_message(self, property_data: Dict[str, Any], 
+                                    old_price: float, new_price: float) -> str:
+        """Build the notification message for a price change"""
+        price_change = new_price - old_price
+        percentage_change = (price_change / old_price * 100) if old_price > 0 else 0
+        
+        return _render_price_change(
+            title=property_data.get('title', 'Unknown Property'),
+            location=property_data.get('location', 'Unknown'),
+            old_price=old_price,
+            new_price=new_price,
+            price_change=price_change,
+            percentage_change=percentage_change,
+            url=property_data.get('url', 'N/A')
+        )
+    
     def send_price_change_notification(self, property_data: Dict[str, Any], 
                                      old_price: float, new_price: float) -> bool:
         """Send notification for price change"""
         try:
-            price_change = new_price - old_price
-            percentage_change = (price_change / old_price * 100) if old_price > 0 else 0
-            
-            message = PRICE_CHANGE_TEMPLATE.format(
-                title=property_data.get('title', 'Unknown Property'),
-                location=property_data.get('location', 'Unknown'),
-                old_price=old_price,
-                new_price=new_price,
-                price_change=price_change,
-                percentage_change=percentage_change,
-                url=property_data.get('url', 'N/A')
-            )
-            
-            return self.send_message(message)
+            return self.send_message(self.format_price_change_message(property_data, old_price, new_price))
             
         except Exception as e:
             logger.error(f"Error sending price change notification: {e}")
             return False
     
-    def send_deleted_listing_notification(self, property_data: Dict[str, Any]) -> bool:
+    def format_deleted_listing_message(self, property_data: Dict[str, Any], now_str: Optional[str] = None) -> str:
+        """Build the notification message for a deleted property listing"""
+        return _render_deleted_listing(
+            title=property_data.get('title', 'Unknown Property'),
+            location=property_data.get('location', 'Unknown'),
+            price=property_data.get('price', 0),
+            date_added=property_data.get('date_added', 'Unknown'),
+            date_removed=now_str or _now_str(),
+            url=property_data.get('url', 'N/A')
+        )
+    
+    def send_deleted_listing_notification(self, property_data: Dict[str, Any], now_str: Optional[str] = None) -> bool:
         """Send notification for deleted property listing"""
         try:
-            message = DELETED_LISTING_TEMPLATE.format(
-                title=property_data.get('title', 'Unknown Property'),
-                location=property_data.get('location', 'Unknown'),
-                price=property_data.get('price', 0),
-                date_added=property_data.get('date_added', 'Unknown'),
-                date_removed=datetime.now().strftime('%Y-%m-%d %H:%M'),
-                url=property_data.get('url', 'N/A')
-            )
-            
-            return self.send_message(message)
+            return self.send_message(self.format_deleted_listing_message(property_data, now_str))
             
         except Exception as e:
             logger.error(f"Error sending deleted listing notification: {e}")
             return False
     
-    def send_status_report(self, stats: Dict[str, Any]) -> bool:
+    def send_status_report(self, stats: Dict[str, Any], now_str: Optional[str] = None) -> bool:
         """Send monitoring status report"""
         try:
-            next_check = datetime.now().strftime('%Y-%m-%d %H:%M')
+            next_check = now_str or _now_str()
             
             # Get current listings summary
             current_listings = self._get_current_listings_summary()
             
-            message = STATUS_REPORT_TEMPLATE.format(
+            message = _render_status_report(
                 last_check=stats.get('last_check', 'Never'),
                 total_properties=stats.get('total_properties', 0),
                 new_today=stats.get('new_today', 0),
@@ -201,10 +336,10 @@ class TelegramNotifier:
             logger.error(f"Error sending status report: {e}")
             return False
     
-    def send_error_notification(self, error_message: str) -> bool:
+    def send_error_notification(self, error_message: str, now_str: Optional[str] = None) -> bool:
         """Send error notification"""
         try:
-            message = f"🚨 *WASL MONITOR ERROR*\n\n❌ Error: {error_message}\n\n⏰ Time: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+            message = f"🚨 *WASL MONITOR ERROR*\n\n❌ Error: {error_message}\n\n⏰ Time: {now_str or _now_str()}"
             return self.send_message(message)
             
         except Exception as e:
@@ -214,7 +349,7 @@ class TelegramNotifier:
     def send_startup_notification(self) -> bool:
         """Send notification when monitoring starts"""
         try:
-            message = f"✅ *WASL PROPERTY MONITOR STARTED*\n\n📍 Monitoring: Ras Al Khor Third Area\n⏰ Started: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n🔄 Check interval: 10 minutes\n\n🤖 Bot: @Wasl_alert1_bot"
+            message = f"✅ *WASL PROPERTY MONITOR STARTED*\n\n📍 Monitoring: Ras Al Khor Third Area\n⏰ Started: {_now_str()}\n🔄 Check interval: 10 minutes\n\n🤖 Bot: @Wasl_alert1_bot"
             return self.send_message(message)
             
         except Exception as e:
@@ -225,7 +360,7 @@ class TelegramNotifier:
         """Test Telegram bot connection"""
         try:
             url = f"{self.api_url}/getMe"
-            response = requests.get(url, timeout=10)
+            response = self._session.get(url, timeout=10)
             response.raise_for_status()
             
             bot_info = response.json()
@@ -0,0 +1,71 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import requests
+    import api_client
+    from config import API_CACHE_MAX_STALE_TTLS, API_CACHE_TTLS, MAX_RETRIES, RETRY_BACKOFF_MAX
+except ImportError:  # requests not installed
+    api_client = None
+
+
+@unittest.skipIf(api_client is None, "requests not installed")
+class RetryAfterTest(unittest.TestCase):
+    def _sleeps_for_retry_after(self, retry_after):
+        response = requests.Response()
+        response.status_code = 429
+        response.headers["Retry-After"] = retry_after
+
+        client = api_client.APIClient()
+        client.session = mock.Mock()
+        client.session.get.return_value = response
+        client._wait_for_rate_limit = lambda: None
+
+        with mock.patch.object(api_client.time, "sleep") as sleep:
+            with self.assertRaises(requests.exceptions.HTTPError):
+                client._make_request_with_retry("https://example.invalid/uncached")
+
+        self.assertEqual(client.session.get.call_count, MAX_RETRIES)
+        return [call.args[0] for call in sleep.call_args_list]
+
+    def test_retry_after_is_honored(self):
+        self.assertEqual(self._sleeps_for_retry_after("2"), [2.0] * (MAX_RETRIES - 1))
+
+    def test_large_retry_after_is_capped(self):
+        self.assertEqual(self._sleeps_for_retry_after("3600"), [RETRY_BACKOFF_MAX] * (MAX_RETRIES - 1))
+
+    def test_negative_retry_after_does_not_sleep(self):
+        self.assertEqual(self._sleeps_for_retry_after("-5"), [0.0] * (MAX_RETRIES - 1))
+
+
+@unittest.skipIf(api_client is None, "requests not installed")
+class StaleFallbackTest(unittest.TestCase):
+    URL = "https://example.invalid/auto-complete"
+
+    def _request_after_outage(self, age_in_ttls):
+        client = api_client.APIClient()
+        client.session = mock.Mock()
+        client.session.get.side_effect = requests.exceptions.ConnectionError("down")
+        client._wait_for_rate_limit = lambda: None
+
+        ttl = API_CACHE_TTLS["/auto-complete"]
+        fetched_at = api_client.time.time() - age_in_ttls * ttl
+        client._store_cached_response(client._cache_key(self.URL), fetched_at + ttl, {"hits": []})
+
+        with mock.patch.object(api_client.time, "sleep"):
+            return client._make_request_with_retry(self.URL)
+
+    def test_recent_stale_response_is_served(self):
+        self.assertEqual(self._request_after_outage(2), {"hits": []})
+
+    def test_too_old_stale_response_is_not_served(self):
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self._request_after_outage(API_CACHE_MAX_STALE_TTLS + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
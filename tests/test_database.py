@@ -0,0 +1,152 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import PropertyDatabase, _legacy_property_hash
+
+
+def _property(external_id, **fields):
+    data = {
+        "external_id": external_id,
+        "title": f"Flat {external_id}",
+        "location": "Ras Al Khor Industrial Third",
+        "property_type": "apartment",
+        "listing_type": "rent",
+        "price": 1000,
+        "source": "test",
+    }
+    data.update(fields)
+    return data
+
+
+class PropertyDatabaseTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+        self.db = PropertyDatabase(self.db_path)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmpdir.cleanup()
+
+    def test_property_hash_independent_of_call_history(self):
+        as_float = _property("1", price=1000.0)
+        as_int = _property("1", price=1000)
+
+        float_first = self.db.generate_property_hash(as_float)
+        self.db.generate_property_hash(as_int)
+        self.assertEqual(self.db.generate_property_hash(as_float), float_first)
+        self.assertNotEqual(self.db.generate_property_hash(as_int), float_first)
+
+    def test_legacy_hash_is_converted_without_reporting_update(self):
+        unchanged = _property("1")
+        repriced = _property("2")
+        self.db.insert_properties_bulk([unchanged, repriced])
+
+        # Simulate rows written before the switch to BLAKE2b
+        with self.db.get_connection() as conn:
+            for data in (unchanged, repriced):
+                conn.execute("UPDATE properties SET property_hash = ? WHERE external_id = ?",
+                             (_legacy_property_hash(data), data["external_id"]))
+
+        changed = self.db.upsert_properties_bulk([unchanged, dict(repriced, price=1200)])
+
+        self.assertEqual([(data["external_id"], old_price) for data, _, old_price in changed], [("2", 1000)])
+        with self.db.get_connection() as conn:
+            hashes = [row[0] for row in conn.execute("SELECT property_hash FROM properties ORDER BY external_id")]
+        self.assertEqual(hashes, [self.db.generate_property_hash(unchanged),
+                                  self.db.generate_property_hash(dict(repriced, price=1200))])
+        self.assertEqual(self.db.upsert_properties_bulk([unchanged]), [])
+
+    def test_inactive_legacy_hashes_do_not_keep_conversion_pending(self):
+        listed, delisted = _property("1"), _property("2")
+        self.db.insert_properties_bulk([listed, delisted])
+        with self.db.get_connection() as conn:
+            for data in (listed, delisted):
+                conn.execute("UPDATE properties SET property_hash = ? WHERE external_id = ?",
+                             (_legacy_property_hash(data), data["external_id"]))
+        self.db.mark_properties_inactive_bulk(["2"])
+
+        self.assertEqual(self.db.upsert_properties_bulk([listed]), [])
+        self.db.upsert_properties_bulk([listed])
+        self.assertFalse(self.db._legacy_hashes_pending)
+
+    def test_relisted_property_is_reported_as_new(self):
+        listing = _property("1")
+        self.db.upsert_properties_bulk([listing])
+        self.db.mark_properties_inactive_bulk(["1"])
+
+        changed = self.db.upsert_properties_bulk([listing])
+
+        self.assertEqual([(data["external_id"], old_price) for data, _, old_price in changed], [("1", None)])
+        self.assertEqual(self.db.diff_active_ids([]), {"1"})
+
+    def test_bulk_seed_overwrites_existing_properties(self):
+        self.db.insert_properties_bulk([_property("1"), _property("2")])
+        self.db.mark_properties_inactive_bulk(["2"])
+
+        seeded = self.db.bulk_seed([_property(str(i), price=2000) for i in range(1, 101)])
+
+        self.assertEqual(seeded, 100)
+        with self.db.get_connection() as conn:
+            count, active, low = conn.execute(
+                "SELECT COUNT(*), SUM(is_active), MIN(price) FROM properties").fetchone()
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertEqual((count, active, low), (100, 100, 2000))
+        self.assertIn("idx_location", indexes)
+
+    def _query(self, sql, params=()):
+        with self.db.get_connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def test_insert_properties_bulk_spans_multi_row_chunks(self):
+        inserted = self.db.insert_properties_bulk([_property(str(i)) for i in range(150)], chunk_size=64)
+
+        self.assertEqual(inserted, 150)
+        self.assertEqual(self._query("SELECT COUNT(*) FROM properties")[0][0], 150)
+
+    def test_upsert_classifies_new_updated_and_unchanged(self):
+        self.db.upsert_properties_bulk([_property("1"), _property("2")])
+
+        changed = self.db.upsert_properties_bulk([
+            _property("1"),                 # unchanged
+            _property("2", price=1500),     # updated
+            _property("3"),                 # new
+        ])
+
+        self.assertEqual([(data["external_id"], old_price) for data, _, old_price in changed],
+                         [("2", 1000), ("3", None)])
+
+    def test_price_change_is_recorded_by_trigger(self):
+        self.db.upsert_properties_bulk([_property("1"), _property("2", price=0)])
+        self.db.upsert_properties_bulk([_property("1", price=1200), _property("2", price=900)])
+
+        # Changes from or to a zero price are not price changes
+        self.assertEqual([tuple(row) for row in self._query("SELECT old_price, new_price FROM price_history")],
+                         [(1000, 1200)])
+
+    def test_updates_touch_date_modified_unless_set_explicitly(self):
+        self.db.upsert_properties_bulk([_property("1")])
+        self._query("UPDATE properties SET date_modified = '2000-01-01 00:00:00'")
+
+        self.db.upsert_properties_bulk([_property("1", price=1100)])
+        touched = self._query("SELECT date_modified FROM properties")[0][0]
+        self.assertNotEqual(touched, "2000-01-01 00:00:00")
+
+        self._query("UPDATE properties SET price = 1200, date_modified = '2001-01-01 00:00:00'")
+        self.assertEqual(self._query("SELECT date_modified FROM properties")[0][0], "2001-01-01 00:00:00")
+
+    def test_diff_active_ids(self):
+        self.db.insert_properties_bulk([_property(str(i)) for i in range(1, 5)])
+        self.db.mark_properties_inactive_bulk(["4"])
+
+        self.assertEqual(self.db.diff_active_ids(["1", "3", "99"]), {"2"})
+        self.assertEqual(self.db.diff_active_ids(iter(["1", "2", "3"])), set())
+        self.assertEqual(self.db.diff_active_ids([]), {"1", "2", "3"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import PropertyDatabase
+
+try:
+    from scheduler import PropertyMonitorScheduler
+except ImportError:  # apscheduler / requests not installed
+    PropertyMonitorScheduler = None
+
+
+def _count_log_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM monitoring_log").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class MonitoringLogShutdownTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_close_persists_queued_log_record(self):
+        db = PropertyDatabase(self.db_path)
+        db.log_monitoring_run("test", 3, 1, 1, 1)
+        db.close()
+
+        self.assertEqual(_count_log_rows(self.db_path), 1)
+
+    @unittest.skipIf(PropertyMonitorScheduler is None, "scheduler dependencies not installed")
+    def test_run_once_persists_log_record(self):
+        db = PropertyDatabase(self.db_path)
+
+        def run_monitoring_cycle():
+            db.log_monitoring_run("test", 3, 1, 1, 1)
+            return {"found": 3, "new": 1, "updated": 1, "deleted": 1}
+
+        scheduler = PropertyMonitorScheduler.__new__(PropertyMonitorScheduler)
+        scheduler.monitor = SimpleNamespace(
+            db=db,
+            telegram=SimpleNamespace(wait_for_queued_messages=lambda: None),
+            test_system=lambda: True,
+            run_monitoring_cycle=run_monitoring_cycle,
+        )
+
+        self.assertTrue(scheduler.run_once())
+        self.assertEqual(_count_log_rows(self.db_path), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
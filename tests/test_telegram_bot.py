@@ -0,0 +1,38 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from telegram_bot import TelegramNotifier
+except ImportError:  # requests not installed
+    TelegramNotifier = None
+
+
+@unittest.skipIf(TelegramNotifier is None, "requests not installed")
+class SplitMessageTest(unittest.TestCase):
+    def setUp(self):
+        # _split_message needs no instance state
+        self.notifier = TelegramNotifier.__new__(TelegramNotifier)
+
+    def test_short_message_is_one_chunk(self):
+        self.assertEqual(self.notifier._split_message("one\ntwo", 20), ["one\ntwo"])
+
+    def test_splits_at_last_newline_that_fits(self):
+        message = "aaaa\nbbbb\ncccc"
+        self.assertEqual(self.notifier._split_message(message, 10), ["aaaa\nbbbb", "cccc"])
+
+    def test_long_line_is_split_hard(self):
+        self.assertEqual(self.notifier._split_message("x" * 25, 10), ["x" * 10, "x" * 10, "x" * 5])
+
+    def test_chunks_fit_and_preserve_content(self):
+        message = "\n".join(f"line {i} " + "y" * (i % 37) for i in range(300))
+        chunks = self.notifier._split_message(message, 4096 // 8)
+
+        self.assertTrue(all(len(chunk) <= 4096 // 8 for chunk in chunks))
+        self.assertEqual("\n".join(chunks), message)
+
+
+if __name__ == "__main__":
+    unittest.main()
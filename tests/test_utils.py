@@ -0,0 +1,70 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils
+from utils import RateLimiter, normalize_location
+
+
+class RateLimiterTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(utils.time, "monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_allows_max_calls_per_window(self):
+        limiter = RateLimiter(3, 10)
+
+        self.assertEqual([limiter.make_call() for _ in range(4)], [True, True, True, False])
+        self.assertEqual(limiter.time_until_next_call(), 10.0)
+
+    def test_oldest_call_expires_first(self):
+        limiter = RateLimiter(2, 10)
+        limiter.make_call()
+        self.now += 4
+        limiter.make_call()
+
+        self.now += 6  # first call is exactly one window old
+        self.assertTrue(limiter.make_call())
+        self.assertFalse(limiter.make_call())
+        self.assertEqual(limiter.time_until_next_call(), 4.0)
+
+    def test_ring_buffer_wraps_around(self):
+        limiter = RateLimiter(2, 10)
+        for _ in range(5):
+            self.assertTrue(limiter.make_call())
+            self.assertTrue(limiter.make_call())
+            self.assertFalse(limiter.make_call())
+            self.now += 10
+
+        self.assertEqual(len(limiter.calls), 2)
+
+    def test_zero_capacity_never_allows_calls(self):
+        limiter = RateLimiter(0, 10)
+
+        self.assertFalse(limiter.make_call())
+        self.assertEqual(limiter.time_until_next_call(), 0.0)
+
+
+class NormalizeLocationTest(unittest.TestCase):
+    def test_variants_map_to_canonical_spelling(self):
+        for location in ("Ras AlKhor Ind 3", "rasalkhor industrial 3", "Ras Al Khor Industrial Area 3"):
+            self.assertEqual(normalize_location(location), "ras al khor industrial third")
+
+    def test_longest_variant_wins(self):
+        # 'industrial area 3' must not be read as 'industrial' + 'area 3'
+        self.assertEqual(normalize_location("industrial area 3"), "industrial third")
+
+    def test_prefix_and_suffix_are_stripped(self):
+        self.assertEqual(normalize_location("Dubai Ras Al Khor Area"), "ras al khor")
+
+    def test_canonical_spelling_is_unchanged(self):
+        self.assertEqual(normalize_location("ras al khor industrial third"), "ras al khor industrial third")
+
+
+if __name__ == "__main__":
+    unittest.main()
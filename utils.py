@@ -1,73 +1,144 @@
 import logging
 import re
+import time
 import hashlib
-from typing import Any, Dict, List, Optional
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
 from datetime import datetime
-from urllib.parse import urlparse
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+_PRICE_STRIP_RE = re.compile(r'[^\d.,]')
+_FIRST_INT_RE = re.compile(r'\d+')
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_FILENAME_BAD_RE = re.compile(r'[<>:"/\\|?*]')
+_URL_RE = re.compile(r'^https?://[^\s/$.?#][^\s]*$', re.IGNORECASE)
+
+_SENTENCE_END_MAP = str.maketrans('!?', '..')
+_CONTROL_CHARS_DELETE = dict.fromkeys(range(32))
+
+_LOCATION_PREFIXES = ('dubai', 'uae', 'united arab emirates')
+_LOCATION_SUFFIXES = ('area', 'district', 'community')
+
+# Common location spellings and their normalized form
+_LOCATION_REPLACEMENTS = {
+    'ras al khor': 'ras al khor',
+    'ras alkhor': 'ras al khor',
+    'rasalkhor': 'ras al khor',
+    'industrial area 3': 'industrial third',
+    'industrial 3': 'industrial third',
+    'ind 3': 'industrial third',
+    'ind third': 'industrial third'
+}
+
+# One alternation over all variants, longest first so the most specific spelling wins;
+# spellings that are already canonical are left out so they never trigger a substitution
+_LOCATION_VARIANT_RE = re.compile(
+    '|'.join(
+        re.escape(old)
+        for old in sorted(_LOCATION_REPLACEMENTS, key=len, reverse=True)
+        if _LOCATION_REPLACEMENTS[old] != old
+    )
+)
+
+def _replace_location_variant(match: re.Match) -> str:
+    return _LOCATION_REPLACEMENTS[match.group(0)]
+
+_LOG_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# (log_level, log_file) of the current configuration and the handlers it installed
+_logging_configured = None
+_logging_handlers: List[logging.Handler] = []
+
 def setup_logging(log_level: str = "INFO", log_file: str = None):
     """Setup logging configuration"""
+    global _logging_configured
     
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    key = (log_level.upper(), log_file)
+    if key == _logging_configured:
+        return
     
     # Setup root logger
     root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, log_level.upper()))
+    root_logger.setLevel(getattr(logging, key[0]))
     
-    # Clear existing handlers
+    # Same destinations as before: only the level changed, keep the handlers
+    if _logging_configured is not None and _logging_configured[1] == log_file:
+        _logging_configured = key
+        return
+    
+    # Clear existing handlers, closing any file this function opened
+    for handler in _logging_handlers:
+        handler.close()
+    _logging_handlers.clear()
     root_logger.handlers.clear()
     
     # Console handler
     console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    console_handler.setFormatter(_LOG_FORMATTER)
+    _logging_handlers.append(console_handler)
     
     # File handler if specified
     if log_file:
         file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        file_handler.setFormatter(_LOG_FORMATTER)
+        _logging_handlers.append(file_handler)
+    
+    for handler in _logging_handlers:
+        root_logger.addHandler(handler)
     
     # Reduce noise from external libraries
     logging.getLogger('requests').setLevel(logging.WARNING)
     logging.getLogger('urllib3').setLevel(logging.WARNING)
     logging.getLogger('apscheduler').setLevel(logging.INFO)
+    
+    _logging_configured = key
+
+@lru_cache(maxsize=4096)
+def _parse_price_cached(price_text: str) -> Optional[float]:
+    """Parse a price string, memoized since listings repeat the same few price formats"""
+    # Remove common currency symbols and text
+    cleaned = _PRICE_STRIP_RE.sub('', price_text)
+    
+    # Handle different decimal separators, locating each one with a single scan
+    last_comma = cleaned.rfind(',')
+    last_period = cleaned.rfind('.')
+    if last_comma >= 0 and last_period >= 0:
+        # Assume comma is thousands separator if it comes before period
+        if last_comma < last_period:
+            cleaned = cleaned.replace(',', '')
+        else:
+            # Assume period is thousands separator
+            cleaned = cleaned.replace('.', '').replace(',', '.')
+    elif last_comma >= 0:
+        # Could be decimal separator (European style) or thousands
+        if len(cleaned) - last_comma - 1 <= 2:
+            cleaned = cleaned.replace(',', '.')
+        else:
+            cleaned = cleaned.replace(',', '')
+    
+    try:
+        return float(cleaned)
+    except ValueError:
+        return None
 
 def extract_price_from_text(price_text: str) -> float:
     """Extract numeric price from text"""
     if not price_text:
         return 0.0
     
-    try:
-        # Remove common currency symbols and text
-        cleaned = re.sub(r'[^\d.,]', '', str(price_text))
-        
-        # Handle different decimal separators
-        if ',' in cleaned and '.' in cleaned:
-            # Assume comma is thousands separator if it comes before period
-            if cleaned.rindex(',') < cleaned.rindex('.'):
-                cleaned = cleaned.replace(',', '')
-            else:
-                # Assume period is thousands separator
-                cleaned = cleaned.replace('.', '').replace(',', '.')
-        elif ',' in cleaned:
-            # Could be decimal separator (European style) or thousands
-            if len(cleaned.split(',')[-1]) <= 2:
-                cleaned = cleaned.replace(',', '.')
-            else:
-                cleaned = cleaned.replace(',', '')
-        
-        return float(cleaned)
-        
-    except (ValueError, AttributeError):
+    price = _parse_price_cached(str(price_text))
+    if price is None:
         logger.warning(f"Could not extract price from: {price_text}")
         return 0.0
+    
+    return price
+
+extract_price_from_text.cache_clear = _parse_price_cached.cache_clear
 
 def extract_number_from_text(text: str) -> int:
     """Extract first number from text"""
@@ -75,21 +146,26 @@ def extract_number_from_text(text: str) -> int:
         return 0
     
     try:
-        match = re.search(r'\d+', str(text))
+        match = _FIRST_INT_RE.search(str(text))
         return int(match.group()) if match else 0
     except (ValueError, AttributeError):
         return 0
 
+@lru_cache(maxsize=4096)
+def _clean_text_cached(text: str) -> str:
+    """Whitespace and HTML cleanup, memoized since scraped text repeats heavily"""
+    # Remove extra whitespace and normalize
+    cleaned = ' '.join(text.split())
+    
+    # Remove HTML tags if present
+    return _HTML_TAG_RE.sub('', cleaned)
+
 def clean_text(text: str, max_length: int = None) -> str:
     """Clean and normalize text"""
     if not text:
         return ""
     
-    # Remove extra whitespace and normalize
-    cleaned = ' '.join(str(text).split())
-    
-    # Remove HTML tags if present
-    cleaned = re.sub(r'<[^>]+>', '', cleaned)
+    cleaned = _clean_text_cached(str(text))
     
     # Truncate if needed
     if max_length and len(cleaned) > max_length:
@@ -97,6 +173,9 @@ def clean_text(text: str, max_length: int = None) -> str:
     
     return cleaned
 
+clean_text.cache_clear = _clean_text_cached.cache_clear
+
+@lru_cache(maxsize=4096)
 def normalize_location(location: str) -> str:
     """Normalize location text for consistent matching"""
     if not location:
@@ -105,59 +184,51 @@ def normalize_location(location: str) -> str:
     # Convert to lowercase and clean
     normalized = location.lower().strip()
     
-    # Remove common prefixes/suffixes
-    prefixes_to_remove = ['dubai', 'uae', 'united arab emirates']
-    suffixes_to_remove = ['area', 'district', 'community']
-    
-    for prefix in prefixes_to_remove:
-        if normalized.startswith(prefix):
-            normalized = normalized[len(prefix):].strip()
+    # Remove common prefixes/suffixes; one tuple check skips the loops in the common case
+    if normalized.startswith(_LOCATION_PREFIXES):
+        for prefix in _LOCATION_PREFIXES:
+            if normalized.startswith(prefix):
+                normalized = normalized[len(prefix):].strip()
     
-    for suffix in suffixes_to_remove:
-        if normalized.endswith(suffix):
-            normalized = normalized[:-len(suffix)].strip()
+    if normalized.endswith(_LOCATION_SUFFIXES):
+        for suffix in _LOCATION_SUFFIXES:
+            if normalized.endswith(suffix):
+                normalized = normalized[:-len(suffix)].strip()
     
-    # Normalize common variations
-    replacements = {
-        'ras al khor': 'ras al khor',
-        'ras alkhor': 'ras al khor',
-        'rasalkhor': 'ras al khor',
-        'industrial area 3': 'industrial third',
-        'industrial 3': 'industrial third',
-        'ind 3': 'industrial third',
-        'ind third': 'industrial third'
-    }
-    
-    for old, new in replacements.items():
-        normalized = normalized.replace(old, new)
-    
-    return normalized
+    # Normalize common variations in a single scan
+    return _LOCATION_VARIANT_RE.sub(_replace_location_variant, normalized)
 
 def is_valid_url(url: str) -> bool:
     """Check if URL is valid"""
     if not url:
         return False
     
-    try:
-        result = urlparse(url)
-        return all([result.scheme, result.netloc])
-    except Exception:
-        return False
+    return _URL_RE.match(url) is not None
+
+# Signature string builder specialised for the fixed dedup fields, compiled once at import
+_SIGNATURE_SOURCE = """
+def build_signature_string(property_data):
+    get = property_data.get
+    return (
+        f"{clean_text(str(get('title', ''))).lower()}|{normalize_location(str(get('location', '')))}"
+        f"|{get('price', 0)!s}|{get('bedrooms', 0)!s}|{get('size_sqft', 0)!s}"
+    )
+"""
+_signature_namespace = {'clean_text': clean_text, 'normalize_location': normalize_location}
+exec(compile(_SIGNATURE_SOURCE, '<signature>', 'exec'), _signature_namespace)
+_build_signature_string = _signature_namespace['build_signature_string']
 
 def generate_property_signature(property_data: Dict[str, Any]) -> str:
     """Generate a unique signature for property deduplication"""
-    # Use key identifying fields
-    signature_data = {
-        'title': clean_text(str(property_data.get('title', ''))).lower(),
-        'location': normalize_location(str(property_data.get('location', ''))),
-        'price': property_data.get('price', 0),
-        'bedrooms': property_data.get('bedrooms', 0),
-        'size_sqft': property_data.get('size_sqft', 0)
-    }
-    
-    # Create hash
-    signature_string = '|'.join(str(v) for v in signature_data.values())
-    return hashlib.md5(signature_string.encode()).hexdigest()
+    # Key identifying fields: title, location, price, bedrooms, size_sqft
+    signature_string = _build_signature_string(property_data)
+    
+    # Create hash (non-cryptographic use; BLAKE2b is faster than MD5 here)
+    return hashlib.blake2b(signature_string.encode(), digest_size=16).hexdigest()
+
+def generate_property_signatures(properties: Iterable[Dict[str, Any]]) -> List[str]:
+    """Generate dedup signatures for many properties, in input order"""
+    return [generate_property_signature(property_data) for property_data in properties]
 
 def format_currency(amount: float, currency: str = "AED") -> str:
     """Format currency amount"""
@@ -183,33 +254,29 @@ def truncate_description(description: str, max_length: int = 200) -> str:
     if not description or len(description) <= max_length:
         return description
     
-    # Try to cut at sentence boundary
+    # Try to cut at sentence boundary, mapping all terminators to '.' for a single rfind
     truncated = description[:max_length]
-    last_sentence_end = max(
-        truncated.rfind('.'),
-        truncated.rfind('!'),
-        truncated.rfind('?')
-    )
+    last_sentence_end = truncated.translate(_SENTENCE_END_MAP).rfind('.')
     
     if last_sentence_end > max_length * 0.7:  # If we found a good cut point
         return truncated[:last_sentence_end + 1]
     else:
         return truncated + "..."
 
+# Field groups checked by validate_property_data, in the order issues are reported
+_REQUIRED_FIELDS = ('external_id', 'title', 'location', 'price', 'source')
+_NUMERIC_FIELDS = ('price', 'bedrooms', 'bathrooms', 'size_sqft')
+
 def validate_property_data(property_data: Dict[str, Any]) -> List[str]:
     """Validate property data and return list of issues"""
-    issues = []
+    get = property_data.get
     
     # Required fields
-    required_fields = ['external_id', 'title', 'location', 'price', 'source']
-    for field in required_fields:
-        if not property_data.get(field):
-            issues.append(f"Missing required field: {field}")
+    issues = [f"Missing required field: {field}" for field in _REQUIRED_FIELDS if not get(field)]
     
     # Data type validation
-    numeric_fields = ['price', 'bedrooms', 'bathrooms', 'size_sqft']
-    for field in numeric_fields:
-        value = property_data.get(field)
+    for field in _NUMERIC_FIELDS:
+        value = get(field)
         if value is not None:
             try:
                 float(value)
@@ -217,12 +284,12 @@ def validate_property_data(property_data: Dict[str, Any]) -> List[str]:
                 issues.append(f"Invalid numeric value for {field}: {value}")
     
     # URL validation
-    url = property_data.get('url')
+    url = get('url')
     if url and not is_valid_url(url):
         issues.append(f"Invalid URL: {url}")
     
     # Price validation
-    price = property_data.get('price', 0)
+    price = get('price', 0)
     if price and (price < 0 or price > 100_000_000):  # Reasonable bounds
         issues.append(f"Price outside reasonable range: {price}")
     
@@ -236,19 +303,18 @@ def get_time_ago(timestamp: str) -> str:
         else:
             dt = timestamp
         
-        now = datetime.now()
-        if dt.tzinfo:
-            now = now.replace(tzinfo=dt.tzinfo)
-        
-        diff = now - dt
+        # Seconds elapsed as plain float arithmetic; aware timestamps convert exactly,
+        # naive ones are taken as local time
+        elapsed = int(time.time() - dt.timestamp())
         
-        if diff.days > 0:
-            return f"{diff.days} day{'s' if diff.days > 1 else ''} ago"
-        elif diff.seconds > 3600:
-            hours = diff.seconds // 3600
+        if elapsed >= 86400:
+            days = elapsed // 86400
+            return f"{days} day{'s' if days > 1 else ''} ago"
+        elif elapsed > 3600:
+            hours = elapsed // 3600
             return f"{hours} hour{'s' if hours > 1 else ''} ago"
-        elif diff.seconds > 60:
-            minutes = diff.seconds // 60
+        elif elapsed > 60:
+            minutes = elapsed // 60
             return f"{minutes} minute{'s' if minutes > 1 else ''} ago"
         else:
             return "Just now"
@@ -259,10 +325,10 @@ def get_time_ago(timestamp: str) -> str:
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename for safe file operations"""
     # Remove or replace problematic characters
-    sanitized = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    sanitized = _FILENAME_BAD_RE.sub('_', filename)
     
     # Remove control characters
-    sanitized = ''.join(char for char in sanitized if ord(char) >= 32)
+    sanitized = sanitized.translate(_CONTROL_CHARS_DELETE)
     
     # Limit length
     if len(sanitized) > 255:
@@ -276,23 +342,26 @@ class RateLimiter:
     def __init__(self, max_calls: int, time_window: int):
         self.max_calls = max_calls
         self.time_window = time_window
-        self.calls = []
+        # Ring buffer of monotonic call times; once full, head is the oldest slot
+        self.calls = array('d', [0.0] * max_calls)
+        self.head = 0
+        self.count = 0
     
     def can_make_call(self) -> bool:
         """Check if a call can be made within rate limits"""
-        now = datetime.now()
-        
-        # Remove old calls outside time window
-        self.calls = [call_time for call_time in self.calls 
-                     if (now - call_time).total_seconds() < self.time_window]
+        if self.count < self.max_calls:
+            return True
         
-        # Check if we can make another call
-        return len(self.calls) < self.max_calls
+        # Full buffer: the oldest call must have left the time window
+        return self.max_calls > 0 and time.monotonic() - self.calls[self.head] >= self.time_window
     
     def make_call(self):
         """Register a call"""
         if self.can_make_call():
-            self.calls.append(datetime.now())
+            self.calls[self.head] = time.monotonic()
+            self.head = (self.head + 1) % self.max_calls
+            if self.count < self.max_calls:
+                self.count += 1
             return True
         return False
     
@@ -301,14 +370,19 @@ class RateLimiter:
         if self.can_make_call():
             return 0.0
         
-        if not self.calls:
+        if not self.count:
             return 0.0
         
-        oldest_call = min(self.calls)
-        time_until_expire = self.time_window - (datetime.now() - oldest_call).total_seconds()
+        # The slot at head holds the oldest call
+        time_until_expire = self.time_window - (time.monotonic() - self.calls[self.head])
         
         return max(0.0, time_until_expire)
 
+@lru_cache(maxsize=32)
+def _bedroom_sort_key(bedroom_type: str) -> int:
+    """Numeric order of a bedroom label ('Studio' first), memoized since only a few labels exist"""
+    return int(bedroom_type.replace('BHK', '').replace('Studio', '0'))
+
 def format_current_listings_summary(listing_counts: Dict[str, Any]) -> str:
     """Format current listings summary for Telegram notifications"""
     if not listing_counts or not listing_counts.get('by_bedrooms'):
@@ -324,7 +398,7 @@ def format_current_listings_summary(listing_counts: Dict[str, Any]) -> str:
     
     # Sort bedroom types
     bedroom_data = listing_counts['by_bedrooms']
-    sorted_bedrooms = sorted(bedroom_data.keys(), key=lambda x: int(x.replace('BHK', '').replace('Studio', '0')))
+    sorted_bedrooms = sorted(bedroom_data, key=_bedroom_sort_key)
     
     for bedroom_type in sorted_bedrooms:
         data = bedroom_data[bedroom_type]
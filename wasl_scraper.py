@@ -1,11 +1,10 @@
-
 #!/usr/bin/env python3
 """
 Real-time Al Wasl Property Scraper using Playwright
 """
 
 import asyncio
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
 
 import random
 
@@ -16,41 +15,91 @@ USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 6.1; WOW64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36",
 ]
 
+SEARCH_URLS = [
+    "https://www.wasl.ae/en/search/residential?location=ras-al-khor-ind-third",
+]
+
+# Extracts every card in the browser as [title, price, href] tuples, so a page costs one round trip
+EXTRACT_CARDS_JS = """
+cards => cards.map(c => [
+    c.querySelector('.title')?.innerText.trim() ?? null,
+    c.querySelector('.price')?.innerText.trim() ?? null,
+    c.querySelector('a')?.getAttribute('href') ?? null
+])
+"""
+
 def get_random_user_agent():
     return random.choice(USER_AGENTS)
 
 from datetime import datetime
 
-def scrape_properties():
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context()
-        page = context.new_page()
-        page.set_extra_http_headers({"User-Agent": get_random_user_agent()})
-        page.goto("https://www.wasl.ae/en/search/residential?location=ras-al-khor-ind-third", timeout=60000)
-        page.wait_for_timeout(5000)  # wait for JS to load content
-
-        listings = []
-        cards = page.query_selector_all(".project-box")
-
-        for card in cards:
-            try:
-                title = card.query_selector(".title").inner_text().strip()
-                price_text = card.query_selector(".price").inner_text().strip()
-                url = card.query_selector("a").get_attribute("href")
-
-                listings.append({
-                    "title": title,
-                    "price": float(''.join(filter(str.isdigit, price_text))),
-                    "url": "https://www.wasl.ae" + url,
-                    "source": "wasl.ae",
-                    "date_scraped": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                })
-            except Exception:
+async def scrape_page(context, url):
+    page = await context.new_page()
+    try:
+        await page.goto(url, timeout=60000)
+        await page.wait_for_timeout(5000)  # wait for JS to load content
+        cards = await page.eval_on_selector_all('.project-box', EXTRACT_CARDS_JS)
+    finally:
+        await page.close()
+
+    # One scrape timestamp for every card on the page
+    date_scraped = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    listings = []
+    for title, price_text, href in cards:
+        try:
+            if title is None or price_text is None or href is None:
                 continue
 
-        browser.close()
-        return listings
+            listings.append({
+                "title": title,
+                "price": float(''.join(filter(str.isdigit, price_text))),
+                "url": "https://www.wasl.ae" + href,
+                "source": "wasl.ae",
+                "date_scraped": date_scraped
+            })
+        except Exception:
+            continue
+
+    return listings
+
+async def scrape_properties_async(urls=SEARCH_URLS):
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            context = await browser.new_context(extra_http_headers={"User-Agent": get_random_user_agent()})
+
+            # Search pages load concurrently in one shared browser context
+            results = await asyncio.gather(*(scrape_page(context, url) for url in urls))
+        finally:
+            await browser.close()
+
+    return [listing for page_listings in results for listing in page_listings]
+
+def scrape_properties():
+    return asyncio.run(scrape_properties_async())
+
+class WaslPropertyScraper:
+    """Wasl source for PropertyAPIManager, returning listings in the monitor's property format"""
+
+    # Every search URL targets Ras Al Khor residential rentals
+    LOCATION = "Ras Al Khor Industrial Third"
+
+    def fetch_properties(self):
+        properties = []
+        for listing in scrape_properties():
+            properties.append({
+                # The listing URL is the only stable identifier a card exposes
+                "external_id": listing["url"],
+                "title": listing["title"],
+                "location": self.LOCATION,
+                "property_type": "residential",
+                "listing_type": "rent",
+                "price": listing["price"],
+                "url": listing["url"],
+                "source": listing["source"],
+            })
+        return properties
 
 if __name__ == "__main__":
     props = scrape_properties()